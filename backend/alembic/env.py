@@ -17,7 +17,7 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.database import Base
-from app.models import User, Question, Attempt, Friendship
+from app.models import User, Question, Attempt, Friendship, TranscriptCache, EvaluationCache, UserStats, TableVersion
 target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
@@ -0,0 +1,53 @@
+"""Add composite indexes for hot query paths
+
+Revision ID: 089ea6eeb836
+Revises: 902063456b59
+Create Date: 2026-10-18 12:02:16.734590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '089ea6eeb836'
+down_revision: Union[str, None] = '902063456b59'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_attempts_user_id_created_at', 'attempts', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_attempts_user_id_score', 'attempts', ['user_id', 'score'], unique=False)
+    op.create_index('ix_attempts_question_id', 'attempts', ['question_id'], unique=False)
+    op.create_index('ix_attempts_status_claimed_at', 'attempts', ['status', 'claimed_at'], unique=False)
+
+    # Keep the oldest row of any duplicated request before enforcing uniqueness
+    op.execute("""
+        DELETE FROM friendships WHERE id NOT IN (
+            SELECT MIN(id) FROM friendships GROUP BY user_id, friend_id
+        )
+    """)
+    op.create_index('ux_friendships_user_id_friend_id', 'friendships', ['user_id', 'friend_id'], unique=True)
+    op.create_index('ix_friendships_user_id_status', 'friendships', ['user_id', 'status'], unique=False)
+    op.create_index('ix_friendships_friend_id_status', 'friendships', ['friend_id', 'status'], unique=False)
+
+    op.create_index('ix_questions_category', 'questions', ['category'], unique=False)
+
+    op.drop_index('ix_user_stats_avg_score', table_name='user_stats')
+    op.create_index('ix_user_stats_avg_score_user_id', 'user_stats', [sa.text('avg_score DESC'), 'user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_stats_avg_score_user_id', table_name='user_stats')
+    op.create_index('ix_user_stats_avg_score', 'user_stats', ['avg_score'], unique=False)
+    op.drop_index('ix_questions_category', table_name='questions')
+    op.drop_index('ix_friendships_friend_id_status', table_name='friendships')
+    op.drop_index('ix_friendships_user_id_status', table_name='friendships')
+    op.drop_index('ux_friendships_user_id_friend_id', table_name='friendships')
+    op.drop_index('ix_attempts_status_claimed_at', table_name='attempts')
+    op.drop_index('ix_attempts_question_id', table_name='attempts')
+    op.drop_index('ix_attempts_user_id_score', table_name='attempts')
+    op.drop_index('ix_attempts_user_id_created_at', table_name='attempts')
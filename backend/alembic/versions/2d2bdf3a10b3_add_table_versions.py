@@ -0,0 +1,34 @@
+"""Add per-table version counters for HTTP caching
+
+Revision ID: 2d2bdf3a10b3
+Revises: 401de56bc798
+Create Date: 2026-10-18 13:05:12.318402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d2bdf3a10b3'
+down_revision: Union[str, None] = '401de56bc798'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    table_versions = op.create_table('table_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(table_versions, [
+        {'name': 'questions', 'version': 1},
+        {'name': 'leaderboard', 'version': 1},
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
@@ -0,0 +1,33 @@
+"""Add audio size and duration columns to attempts
+
+Revision ID: 3e759049d281
+Revises: 791b75e23e44
+Create Date: 2026-10-18 15:02:41.338207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e759049d281'
+down_revision: Union[str, None] = '791b75e23e44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('attempts', sa.Column('audio_bytes', sa.Integer(), nullable=True))
+    op.add_column('attempts', sa.Column('audio_seconds', sa.Float(), nullable=True))
+    op.add_column('attempts', sa.Column('processed_bytes', sa.Integer(), nullable=True))
+    op.add_column('attempts', sa.Column('speech_seconds', sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('attempts') as batch_op:
+        batch_op.drop_column('speech_seconds')
+        batch_op.drop_column('processed_bytes')
+        batch_op.drop_column('audio_seconds')
+        batch_op.drop_column('audio_bytes')
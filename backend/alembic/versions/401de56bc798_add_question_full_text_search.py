@@ -0,0 +1,85 @@
+"""Add full-text search index over questions
+
+Revision ID: 401de56bc798
+Revises: 4d1db453f62c
+Create Date: 2026-10-18 13:31:52.640119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '401de56bc798'
+down_revision: Union[str, None] = '4d1db453f62c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # External-content FTS5 table mirrored from questions by triggers
+        op.execute("""
+            CREATE VIRTUAL TABLE questions_fts USING fts5(
+                title, description,
+                content='questions', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+        op.execute("""
+            CREATE TRIGGER questions_fts_insert AFTER INSERT ON questions BEGIN
+                INSERT INTO questions_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER questions_fts_delete AFTER DELETE ON questions BEGIN
+                INSERT INTO questions_fts(questions_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+        """)
+        op.execute("""
+            CREATE TRIGGER questions_fts_update AFTER UPDATE OF title, description ON questions BEGIN
+                INSERT INTO questions_fts(questions_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO questions_fts(rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+        """)
+        op.execute("INSERT INTO questions_fts(questions_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.add_column('questions', sa.Column('search_vector', sa.dialects.postgresql.TSVECTOR(), nullable=True))
+        op.execute("""
+            CREATE FUNCTION questions_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B');
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute("""
+            CREATE TRIGGER questions_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF title, description ON questions
+            FOR EACH ROW EXECUTE FUNCTION questions_search_vector_update()
+        """)
+        op.execute("UPDATE questions SET title = title")
+        op.execute("CREATE INDEX ix_questions_search_vector ON questions USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS questions_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS questions_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS questions_fts_insert")
+        op.execute("DROP TABLE IF EXISTS questions_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_questions_search_vector")
+        op.execute("DROP TRIGGER IF EXISTS questions_search_vector_trigger ON questions")
+        op.execute("DROP FUNCTION IF EXISTS questions_search_vector_update()")
+        op.drop_column('questions', 'search_vector')
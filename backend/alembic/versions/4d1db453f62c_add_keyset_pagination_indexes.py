@@ -0,0 +1,34 @@
+"""Add keyset pagination indexes
+
+Revision ID: 4d1db453f62c
+Revises: 089ea6eeb836
+Create Date: 2026-10-18 12:48:33.210476
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d1db453f62c'
+down_revision: Union[str, None] = '089ea6eeb836'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_questions_category', table_name='questions')
+    op.create_index('ix_questions_created_at_id', 'questions', ['created_at', 'id'], unique=False)
+    op.create_index('ix_questions_category_created_at_id', 'questions', ['category', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_attempts_user_id_created_at', table_name='attempts')
+    op.create_index('ix_attempts_user_id_created_at_id', 'attempts', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attempts_user_id_created_at_id', table_name='attempts')
+    op.create_index('ix_attempts_user_id_created_at', 'attempts', ['user_id', 'created_at'], unique=False)
+    op.drop_index('ix_questions_category_created_at_id', table_name='questions')
+    op.drop_index('ix_questions_created_at_id', table_name='questions')
+    op.create_index('ix_questions_category', 'questions', ['category'], unique=False)
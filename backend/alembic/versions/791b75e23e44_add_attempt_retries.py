@@ -0,0 +1,27 @@
+"""Add retry counter to attempts
+
+Revision ID: 791b75e23e44
+Revises: 2d2bdf3a10b3
+Create Date: 2026-10-18 13:48:27.604119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '791b75e23e44'
+down_revision: Union[str, None] = '2d2bdf3a10b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('attempts', sa.Column('retries', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('attempts') as batch_op:
+        batch_op.drop_column('retries')
@@ -0,0 +1,43 @@
+"""Add per-user leaderboard stats
+
+Revision ID: 902063456b59
+Revises: cc7e7ad18f30
+Create Date: 2026-10-18 11:20:48.906115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '902063456b59'
+down_revision: Union[str, None] = 'cc7e7ad18f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('sum_score', sa.Float(), nullable=False),
+    sa.Column('scored_attempts', sa.Integer(), nullable=False),
+    sa.Column('avg_score', sa.Float(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(op.f('ix_user_stats_avg_score'), 'user_stats', ['avg_score'], unique=False)
+    # Backfill from existing attempts
+    op.execute("""
+        INSERT INTO user_stats (user_id, sum_score, scored_attempts, avg_score)
+        SELECT users.id, COALESCE(SUM(attempts.score), 0), COUNT(attempts.score), AVG(attempts.score)
+        FROM users LEFT OUTER JOIN attempts ON users.id = attempts.user_id
+        GROUP BY users.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_stats_avg_score'), table_name='user_stats')
+    op.drop_table('user_stats')
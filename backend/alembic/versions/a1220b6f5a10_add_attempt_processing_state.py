@@ -0,0 +1,36 @@
+"""Add attempt processing state
+
+Revision ID: a1220b6f5a10
+Revises: a5a0eb4a0431
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1220b6f5a10'
+down_revision: Union[str, None] = 'a5a0eb4a0431'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing attempts were processed inline, so they are already finished.
+    op.add_column('attempts', sa.Column('status', sa.String(), server_default='completed', nullable=False))
+    op.add_column('attempts', sa.Column('stage', sa.String(), nullable=True))
+    op.add_column('attempts', sa.Column('error', sa.Text(), nullable=True))
+    op.add_column('attempts', sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE attempts SET status = 'failed' WHERE score IS NULL")
+    op.execute("UPDATE attempts SET stage = 'done' WHERE score IS NOT NULL")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('attempts') as batch_op:
+        batch_op.drop_column('claimed_at')
+        batch_op.drop_column('error')
+        batch_op.drop_column('stage')
+        batch_op.drop_column('status')
@@ -0,0 +1,35 @@
+"""Add evaluation cache
+
+Revision ID: cc7e7ad18f30
+Revises: e3a2f006ded4
+Create Date: 2026-10-18 10:41:05.302871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'cc7e7ad18f30'
+down_revision: Union[str, None] = 'e3a2f006ded4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('evaluation_cache',
+    sa.Column('cache_key', sa.String(), nullable=False),
+    sa.Column('model', sa.String(), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index(op.f('ix_evaluation_cache_prompt_version'), 'evaluation_cache', ['prompt_version'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_evaluation_cache_prompt_version'), table_name='evaluation_cache')
+    op.drop_table('evaluation_cache')
@@ -0,0 +1,36 @@
+"""Add transcript cache keyed by audio hash
+
+Revision ID: e3a2f006ded4
+Revises: a1220b6f5a10
+Create Date: 2026-10-18 10:03:27.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a2f006ded4'
+down_revision: Union[str, None] = 'a1220b6f5a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('transcript_cache',
+    sa.Column('audio_hash', sa.String(), nullable=False),
+    sa.Column('transcript', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('audio_hash')
+    )
+    op.add_column('attempts', sa.Column('audio_hash', sa.String(), nullable=True))
+    op.create_index(op.f('ix_attempts_audio_hash'), 'attempts', ['audio_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_attempts_audio_hash'), table_name='attempts')
+    with op.batch_alter_table('attempts') as batch_op:
+        batch_op.drop_column('audio_hash')
+    op.drop_table('transcript_cache')
@@ -1,9 +1,13 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 import os
 from dotenv import load_dotenv
+from . import metrics
 
 load_dotenv()
 
@@ -13,6 +17,18 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt runs in its own processes so login bursts cannot starve the shared threadpool
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+# Jobs allowed to wait for a worker before new ones are shed with 503
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_jobs = 0  # Running plus queued; only touched from the event loop
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing queue is full"""
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
@@ -24,6 +40,48 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(
+            max_workers=PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_executor
+
+
+async def _run_password_job(func, *args):
+    """Run a bcrypt call in the dedicated pool, shedding load once the queue is full"""
+    global _hash_jobs
+    if _hash_jobs >= PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE:
+        metrics.incr("password_hasher.shed")
+        raise PasswordHasherBusy()
+    _hash_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _hash_jobs -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the password hashing pool"""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the password hashing pool"""
+    return await _run_password_job(get_password_hash, password)
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the password hashing processes (called on shutdown)"""
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
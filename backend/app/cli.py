@@ -0,0 +1,31 @@
+import argparse
+from .database import SessionLocal
+from .services.leaderboard import rebuild_user_stats
+
+
+def _rebuild_user_stats(args) -> None:
+    db = SessionLocal()
+    try:
+        count = rebuild_user_stats(db)
+    finally:
+        db.close()
+    print(f"Rebuilt leaderboard stats for {count} users")
+
+
+def main() -> None:
+    """Maintenance commands, e.g. `python -m app.cli rebuild-user-stats`"""
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser(
+        "rebuild-user-stats",
+        help="Backfill the leaderboard aggregates from existing attempts"
+    )
+    rebuild.set_defaults(func=_rebuild_user_stats)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
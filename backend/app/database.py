@@ -1,20 +1,122 @@
-from sqlalchemy import create_engine
+import importlib.util
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+from fastapi import Request
 from dotenv import load_dotenv
+from . import metrics
+from .middleware import wrote_recently
+from .pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, register_pool_metrics
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pm_practice.db")
+# Optional read-only replica for pure-read routes; unset means reads use DATABASE_URL
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+
+# Connection pool, per engine (the sync and async engines each get one)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Replace connections older than this many seconds (-1 = never)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite only: how long a writer waits on a lock before failing, and the mmap window
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Async drivers used by the request path for each sync backend, and the package providing each
+ASYNC_DRIVERS = {
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+}
+
+
+def async_database_url(url: str) -> str:
+    """Same database as `url`, addressed through its asyncio driver"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"Unsupported database {backend!r} in the database URL; "
+                           f"expected one of {', '.join(ASYNC_DRIVERS)}")
+    drivername, package = ASYNC_DRIVERS[backend]
+    if importlib.util.find_spec(package) is None:
+        raise RuntimeError(f"{backend} databases need the {package} driver for the async engine; "
+                           f"`pip install {package}`")
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def _pool_options(url: str, poolclass) -> dict:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}  # In-memory SQLite lives in a single connection; keep SQLAlchemy's default pool
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+    }
+
+
+def _apply_sqlite_read_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")  # A stray write to the replica fails instead of diverging
+    cursor.close()
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """WAL lets the scoring worker write while API requests keep reading"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, no fsync per commit
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.close()
+
 
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
+    pool_logging_name="sync",
+    **_pool_options(DATABASE_URL, InstrumentedQueuePool)
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Routers serve requests on the event loop through this engine; the worker and CLI stay sync
+async_engine = create_async_engine(
+    async_database_url(DATABASE_URL),
+    pool_logging_name="async",
+    **_pool_options(DATABASE_URL, InstrumentedAsyncQueuePool)
+)
+
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _apply_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+register_pool_metrics(engine, "sync")
+register_pool_metrics(async_engine.sync_engine, "async")
+
+read_engine = async_engine
+if READ_DATABASE_URL:
+    read_engine = create_async_engine(
+        async_database_url(READ_DATABASE_URL),
+        pool_logging_name="read",
+        **_pool_options(READ_DATABASE_URL, InstrumentedAsyncQueuePool)
+    )
+    if read_engine.dialect.name == "sqlite":
+        event.listen(read_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+        event.listen(read_engine.sync_engine, "connect", _apply_sqlite_read_only)
+    register_pool_metrics(read_engine.sync_engine, "read")
+
+# expire_on_commit=False so committed rows can still be serialized without a lazy (blocking) reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+ReadSessionLocal = async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -25,3 +127,22 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting async database sessions"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db(request: Request):
+    """Dependency for pure-read routes: the replica, unless this client wrote moments ago"""
+    session_factory = ReadSessionLocal
+    if read_engine is not async_engine:
+        if wrote_recently(request.scope):
+            metrics.incr("read_db.primary_after_write")
+            session_factory = AsyncSessionLocal
+        else:
+            metrics.incr("read_db.replica")
+    async with session_factory() as db:
+        yield db
@@ -1,19 +1,65 @@
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from .database import get_db
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+from . import metrics
+from .cache import LRUCache
+from .database import get_async_db
 from .auth import decode_access_token
 from .models import User
 
+load_dotenv()
+
 security = HTTPBearer()
 
+# Verified tokens remembered per process; entries never outlive the token's exp
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+
+_token_cache = LRUCache(maxsize=AUTH_CACHE_SIZE)
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Detached snapshot of the user behind a verified token"""
+    id: int
+    username: str
+    email: str
+    created_at: datetime
+
+
+def invalidate_user(user_id: int) -> None:
+    """Forget cached tokens for a user whose row changed"""
+    _token_cache.discard_where(lambda token, user: user.id == user_id)
 
-def get_current_user(
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target) -> None:
+    invalidate_user(target.id)
+
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
     """Get the current authenticated user from JWT token"""
-    token = credentials.credentials
+    return await authenticate_token(credentials.credentials, db)
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> AuthenticatedUser:
+    """Resolve a bearer token to its user, raising 401 if it is invalid"""
+    cached = _token_cache.get(token)
+    if cached is not None:
+        metrics.incr("auth_cache.hits")
+        return cached
+    metrics.incr("auth_cache.misses")
+
     payload = decode_access_token(token)
 
     if payload is None:
@@ -23,15 +69,16 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_id: int = payload.get("sub")
-    if user_id is None:
+    sub = payload.get("sub")
+    if sub is None or not str(sub).isdigit():
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    user_id = int(sub)
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).where(User.id == user_id))
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,4 +86,13 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user
+    snapshot = AuthenticatedUser(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        created_at=user.created_at
+    )
+    ttl = min(AUTH_CACHE_TTL, payload.get("exp", 0) - time.time())
+    if ttl > 0:
+        _token_cache.set(token, snapshot, ttl=ttl)
+    return snapshot
@@ -0,0 +1,46 @@
+import os
+from typing import Callable, Optional
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+from . import metrics
+from .database import get_read_db
+from .services.versions import get_version_async
+
+load_dotenv()
+
+# Seconds browsers and CDNs may reuse a response before revalidating with If-None-Match
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "5"))
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def versioned(dataset: str, deferred: bool = False):
+    """Dependency adding an ETag derived from `dataset`'s version and answering 304 when it matches.
+
+    Item routes pass deferred=True and get the 304 check back, to call once the item is known to
+    exist; otherwise a matching tag (or `*`) would answer 304 for an id that was never there.
+    """
+    async def check(request: Request, response: Response,
+                    db: AsyncSession = Depends(get_read_db)) -> Optional[Callable[[], None]]:
+        etag = f'"{dataset}-{await get_version_async(db, dataset)}"'
+        headers = {"ETag": etag, "Cache-Control": f"public, max-age={HTTP_CACHE_MAX_AGE}"}
+        if_none_match = request.headers.get("if-none-match")
+
+        def not_modified() -> None:
+            if if_none_match and _etag_matches(if_none_match, etag):
+                metrics.incr("http_cache.not_modified")
+                raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        response.headers.update(headers)
+        if deferred:
+            return not_modified
+        not_modified()
+        return None
+    return check
@@ -1,16 +1,52 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routes import auth, questions, attempts, friends, leaderboard
+from .middleware import ReadYourWritesMiddleware, UploadSizeLimitMiddleware
+from . import metrics
+from .auth import shutdown_password_hasher
+from .database import async_engine, read_engine
+from .services import worker, providers, transcription
+from .services.storage import max_upload_bytes
 
-app = FastAPI(title="PM Interview Practice API")
 
-# CORS configuration
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the transcription model (if local) before serving, then start the background pool
+    # that transcribes and scores queued attempts
+    await transcription.start_transcriber()
+    worker.start_workers()
+    yield
+    await worker.stop_workers()
+    await transcription.close_transcriber()
+    await providers.close_clients()
+    shutdown_password_hasher()
+    await async_engine.dispose()
+    if read_engine is not async_engine:
+        await read_engine.dispose()
+
+
+app = FastAPI(title="PM Interview Practice API", lifespan=lifespan)
+
+# Abort oversized audio uploads mid-stream (1 MiB headroom for the other form fields)
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=max_upload_bytes() + 1024 * 1024,
+    paths=("/attempts",),
+)
+
+# Pin clients to the primary database briefly after their own writes
+app.add_middleware(ReadYourWritesMiddleware)
+
+# CORS configuration; added last so it is the outermost layer and also covers the
+# responses the middlewares above send themselves, such as the 413 for an oversized upload
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],  # Vite default port
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -27,3 +63,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
@@ -0,0 +1,42 @@
+import threading
+from collections import defaultdict
+from typing import Callable, Dict
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = defaultdict(int)
+_gauges: Dict[str, Callable[[], float]] = {}
+
+
+def incr(name: str, amount: float = 1) -> None:
+    """Increment a process-local counter"""
+    with _lock:
+        _counters[name] += amount
+
+
+def observe(name: str, value: float) -> None:
+    """Record one sample of a distribution as <name>.count, .total and .max"""
+    with _lock:
+        _counters[f"{name}.count"] += 1
+        _counters[f"{name}.total"] += value
+        _counters[f"{name}.max"] = max(_counters[f"{name}.max"], value)
+
+
+def value(name: str) -> float:
+    """Current value of one counter (0 if never incremented)"""
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def register_gauge(name: str, read: Callable[[], float]) -> None:
+    """Report the current value of `read()` under `name` in every snapshot"""
+    with _lock:
+        _gauges[name] = read
+
+
+def snapshot() -> Dict[str, float]:
+    """Current value of every counter and gauge"""
+    with _lock:
+        values = dict(_counters)
+        gauges = list(_gauges.items())
+    values.update((name, read()) for name, read in gauges)
+    return values
@@ -0,0 +1,102 @@
+import os
+from typing import List
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from dotenv import load_dotenv
+from .cache import LRUCache
+
+load_dotenv()
+
+# After a successful write, that client's reads go to the primary for this long
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+_recent_writers = LRUCache(maxsize=10000, ttl=READ_YOUR_WRITES_SECONDS)
+
+
+class _BodyTooLarge(HTTPException):
+    # An HTTPException so body parsing re-raises it and the app answers 413
+    def __init__(self):
+        super().__init__(status_code=413, detail="Upload too large")
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized request bodies while they stream in, before the form is buffered"""
+
+    def __init__(self, app: ASGIApp, max_body_size: int, paths: tuple = ()):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.paths = paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+
+        too_large = JSONResponse(
+            {"detail": "Upload too large"},
+            status_code=413
+        )
+
+        # Cheap early rejection when the client announces the size up front
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_body_size:
+                await too_large(scope, receive, send)
+                return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if response_started:
+                raise
+            await too_large(scope, receive, send)
+
+
+def _writer_keys(scope: Scope) -> List:
+    """Bearer token of the request; never the client address, which a proxy or NAT shares between users"""
+    return [("token", value) for name, value in scope["headers"] if name == b"authorization"]
+
+
+def wrote_recently(scope: Scope) -> bool:
+    """Whether this request's client made a successful write within READ_YOUR_WRITES_SECONDS"""
+    return any(_recent_writers.get(key) for key in _writer_keys(scope))
+
+
+class ReadYourWritesMiddleware:
+    """Remember clients whose write just succeeded so get_read_db can pin them to the primary"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def tracking_send(message: Message) -> None:
+            # The handler has committed by the time the response starts
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                for key in _writer_keys(scope):
+                    _recent_writers.set(key, True)
+            await send(message)
+
+        await self.app(scope, receive, tracking_send)
@@ -2,5 +2,10 @@ from .user import User
 from .question import Question
 from .attempt import Attempt
 from .friendship import Friendship
+from .transcript_cache import TranscriptCache
+from .evaluation_cache import EvaluationCache
+from .user_stats import UserStats
+from .table_version import TableVersion
 
-__all__ = ["User", "Question", "Attempt", "Friendship"]
+__all__ = ["User", "Question", "Attempt", "Friendship", "TranscriptCache", "EvaluationCache", "UserStats",
+           "TableVersion"]
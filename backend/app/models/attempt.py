@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -6,14 +6,31 @@ from ..database import Base
 
 class Attempt(Base):
     __tablename__ = "attempts"
+    __table_args__ = (
+        Index("ix_attempts_user_id_created_at_id", "user_id", "created_at", "id"),  # User history pages
+        Index("ix_attempts_user_id_score", "user_id", "score"),  # Covers stats rebuilds
+        Index("ix_attempts_question_id", "question_id"),
+        Index("ix_attempts_status_claimed_at", "status", "claimed_at"),  # Worker queue polling
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
     audio_url = Column(String, nullable=True)  # Path to stored audio file
+    audio_hash = Column(String, nullable=True, index=True)  # SHA-256 of the audio, keys the transcript cache
+    audio_bytes = Column(Integer, nullable=True)  # Size of the stored recording
+    audio_seconds = Column(Float, nullable=True)  # Decoded length of the recording
+    processed_bytes = Column(Integer, nullable=True)  # Size of the compact copy sent for transcription
+    speech_seconds = Column(Float, nullable=True)  # Length sent for transcription, after silence trimming
     transcript = Column(Text, nullable=True)  # Whisper transcription
     score = Column(Float, nullable=True)  # Overall score from Claude
     feedback = Column(JSON, nullable=True)  # Detailed feedback from Claude
+    status = Column(String, nullable=False, default="queued")  # queued, processing, completed, failed
+    stage = Column(String, nullable=True)  # transcribing, evaluating, done
+    error = Column(Text, nullable=True)  # Last processing error, if any
+    # When a worker picked up the job; on a queued retry, the earliest time it may be picked up again
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    retries = Column(Integer, nullable=False, default=0, server_default="0")  # Re-queues after provider outages
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class EvaluationCache(Base):
+    __tablename__ = "evaluation_cache"
+
+    cache_key = Column(String, primary_key=True)  # Hash of question, transcript, model and prompt version
+    model = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False, index=True)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
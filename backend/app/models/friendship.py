@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, String
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, String, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -6,6 +6,12 @@ from ..database import Base
 
 class Friendship(Base):
     __tablename__ = "friendships"
+    __table_args__ = (
+        # One row per direction; makes the duplicate-request check an index probe
+        Index("ux_friendships_user_id_friend_id", "user_id", "friend_id", unique=True),
+        Index("ix_friendships_user_id_status", "user_id", "status"),
+        Index("ix_friendships_friend_id_status", "friend_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
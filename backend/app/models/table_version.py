@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    name = Column(String(50), primary_key=True)  # Logical dataset, e.g. "questions" or "leaderboard"
+    version = Column(Integer, nullable=False, default=0)  # Bumped in the same transaction as each write
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, Text, DateTime
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class TranscriptCache(Base):
+    __tablename__ = "transcript_cache"
+
+    audio_hash = Column(String, primary_key=True)  # SHA-256 of the audio, prefixed by backend unless it is the API
+    transcript = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
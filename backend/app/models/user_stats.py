@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index, text
+from sqlalchemy.sql import func
+from ..database import Base
+
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+    __table_args__ = (
+        # Matches the leaderboard ORDER BY avg_score DESC, user_id
+        Index("ix_user_stats_avg_score_user_id", text("avg_score DESC"), "user_id"),
+    )
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    sum_score = Column(Float, nullable=False, default=0)  # Sum of all attempt scores
+    scored_attempts = Column(Integer, nullable=False, default=0)  # Attempts that received a score
+    avg_score = Column(Float, nullable=True)  # NULL until the first scored attempt
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
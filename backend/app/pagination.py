@@ -0,0 +1,84 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import and_, func, or_, select
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Pack the sort key of the last row returned into an opaque cursor"""
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Inverse of encode_cursor; raises ValueError for anything malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _keyset_condition(model, cursor: str, descending: bool):
+    values = decode_cursor(cursor)
+    # bool is an int subclass, and fromisoformat raises TypeError rather than ValueError for non-strings
+    if (len(values) != 2 or not isinstance(values[0], (str, type(None)))
+            or not isinstance(values[1], int) or isinstance(values[1], bool)):
+        raise ValueError("Invalid cursor")
+    created_at = datetime.fromisoformat(values[0]) if values[0] else None
+    row_id = values[1]
+
+    # Compare against the anchor row's stored created_at rather than a re-bound
+    # literal, so ties are exact regardless of how the driver formats datetimes;
+    # the cursor's own timestamp only matters if the anchor row was deleted
+    anchor = select(model.created_at).where(model.id == row_id).scalar_subquery()
+    anchor_created_at = func.coalesce(anchor, created_at)
+    # The leading inclusive bound lets the planner seek the index instead of filtering from the start
+    if descending:
+        return and_(
+            model.created_at <= anchor_created_at,
+            or_(model.created_at < anchor_created_at, model.id < row_id)
+        )
+    return and_(
+        model.created_at >= anchor_created_at,
+        or_(model.created_at > anchor_created_at, model.id > row_id)
+    )
+
+
+def keyset_query(query, model, cursor: Optional[str], descending: bool = False):
+    """Order `query` by (created_at, id) and start it just after the cursor row"""
+    if cursor:
+        query = query.filter(_keyset_condition(model, cursor, descending))
+    if descending:
+        return query.order_by(model.created_at.desc(), model.id.desc())
+    return query.order_by(model.created_at, model.id)
+
+
+def _page(rows: list, limit: int) -> Tuple[list, Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    created_at = last.created_at.isoformat() if last.created_at else None
+    return rows, encode_cursor([created_at, last.id])
+
+
+def keyset_page(query, model, cursor: Optional[str], limit: int, descending: bool = False) -> Tuple[list, Optional[str]]:
+    """One page of `query` ordered by (created_at, id), plus the cursor for the next page"""
+    rows = keyset_query(query, model, cursor, descending).limit(limit + 1).all()
+    return _page(rows, limit)
+
+
+async def keyset_page_async(db, statement, model, cursor: Optional[str], limit: int,
+                            descending: bool = False) -> Tuple[list, Optional[str]]:
+    """keyset_page for a select() of ORM entities run on an AsyncSession"""
+    statement = keyset_query(statement, model, cursor, descending).limit(limit + 1)
+    rows = list((await db.scalars(statement)).all())
+    return _page(rows, limit)
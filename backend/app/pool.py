@@ -0,0 +1,42 @@
+import time
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from . import metrics
+
+
+class _TimedCheckout:
+    """Pool mixin reporting how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        prefix = f"db.pool.{self.logging_name or 'default'}"
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.incr(f"{prefix}.timeouts")
+            raise
+        finally:
+            metrics.observe(f"{prefix}.checkout_wait_ms", (time.perf_counter() - started) * 1000)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def _saturation(pool) -> float:
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    return pool.checkedout() / capacity if capacity else 0.0
+
+
+def register_pool_metrics(engine: Engine, name: str) -> None:
+    """Publish checked-out connections and saturation (0-1) of an engine's pool as gauges"""
+    if not isinstance(engine.pool, QueuePool):
+        return  # e.g. in-memory SQLite's single-connection pool
+    # Read engine.pool on every snapshot; dispose() swaps in a new pool object
+    metrics.register_gauge(f"db.pool.{name}.checked_out", lambda: engine.pool.checkedout())
+    metrics.register_gauge(f"db.pool.{name}.saturation", lambda: round(_saturation(engine.pool), 3))
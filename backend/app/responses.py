@@ -0,0 +1,11 @@
+from typing import Any
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+
+def fast_json(content: Any, response: Response) -> ORJSONResponse:
+    """Encode rows already shaped like the route's response_model with orjson, skipping validation"""
+    fast = ORJSONResponse(content)
+    # FastAPI drops headers set on the injected response (cursors, ETags) when a route returns its own
+    fast.headers.raw.extend(response.headers.raw)
+    return fast
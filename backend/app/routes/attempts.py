@@ -1,102 +1,256 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from sqlalchemy.orm import Session
-from typing import List
-import os
-import uuid
-from ..database import get_db
-from ..models import Attempt, User, Question
-from ..schemas import AttemptResponse
-from ..dependencies import get_current_user
-from ..services.transcription import transcribe_audio
-from ..services.evaluation import evaluate_pm_answer
+import asyncio
+import json
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, UploadFile, File, Form, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from typing import List, Optional
+from ..database import AsyncSessionLocal, get_async_db
+from ..models import Attempt
+from ..schemas import AttemptResponse, AttemptStatusResponse, AttemptListItem, AttemptSummary
+from ..dependencies import authenticate_token, get_current_user, AuthenticatedUser
+from ..pagination import keyset_page_async, NEXT_CURSOR_HEADER
+from ..responses import fast_json
+from ..services import events, question_cache
+from ..services.live import LiveSession, LiveSessionError, LIVE_IDLE_TIMEOUT, SAMPLE_RATES
+from ..services.storage import save_upload, UploadTooLarge
+from ..services.worker import notify_workers
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/attempts", tags=["attempts"])
 
-# Create uploads directory
-UPLOAD_DIR = "uploads/audio"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Columns every listing row carries; the rest stay unloaded unless asked for with `fields=`.
+# Taken from the schemas because fast_json skips response_model validation
+SUMMARY_FIELDS = tuple(AttemptSummary.model_fields)
+OPTIONAL_FIELDS = tuple(name for name in AttemptListItem.model_fields if name not in SUMMARY_FIELDS)
+
 
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    requested = [name.strip() for name in (fields or "").split(",") if name.strip()]
+    unknown = [name for name in requested if name not in SUMMARY_FIELDS + OPTIONAL_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return [name for name in OPTIONAL_FIELDS if name in requested]
 
-@router.post("/", response_model=AttemptResponse, status_code=status.HTTP_201_CREATED)
+
+@router.post("/", response_model=AttemptResponse, status_code=status.HTTP_202_ACCEPTED)
 async def create_attempt(
     question_id: int = Form(...),
     audio: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Submit an attempt with audio recording"""
+    """Submit an attempt with audio recording and queue it for scoring"""
 
     # Check if question exists
-    question = db.query(Question).filter(Question.id == question_id).first()
+    question = await question_cache.get_question(db, question_id)
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question not found"
         )
 
-    # Save audio file
+    # Stream audio file to disk without holding a pooled connection for the whole upload
+    await db.rollback()
     file_extension = audio.filename.split('.')[-1] if '.' in audio.filename else 'webm'
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, unique_filename)
-
-    with open(file_path, "wb") as f:
-        content = await audio.read()
-        f.write(content)
+    try:
+        stored = await save_upload(audio, file_extension)
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Audio exceeds the {e.limit} byte limit"
+        )
 
-    # Create attempt record
+    # Create attempt record; transcription and evaluation run in the worker pool
     new_attempt = Attempt(
         user_id=current_user.id,
         question_id=question_id,
-        audio_url=file_path
+        audio_url=stored.path,
+        audio_hash=stored.sha256,
+        audio_bytes=stored.size,
+        status="queued"
     )
     db.add(new_attempt)
-    db.commit()
-    db.refresh(new_attempt)
+    await db.commit()
+    await db.refresh(new_attempt)
+    notify_workers()
+
+    return new_attempt
+
 
-    # Transcribe audio and evaluate
+LIVE_OPENING = 'Expected {"token", "question_id", "sample_rate"} as the first message'
+
+
+def _control_type(text: str) -> Optional[str]:
     try:
-        # Step 1: Transcribe
-        transcript = await transcribe_audio(file_path)
-        new_attempt.transcript = transcript
-        db.commit()
-
-        # Step 2: Evaluate with Claude
-        evaluation = await evaluate_pm_answer(
-            question.title,
-            question.description,
-            transcript
+        message = json.loads(text)
+    except json.JSONDecodeError:
+        return None
+    return message.get("type") if isinstance(message, dict) else None
+
+
+async def _start_live(message: dict):
+    """Validate a live session's opening message; returns (user, question_id, sample_rate)"""
+    try:
+        token = str(message["token"])
+        question_id = int(message["question_id"])
+        sample_rate = int(message.get("sample_rate", 16000))
+    except (KeyError, TypeError, ValueError):
+        raise LiveSessionError(LIVE_OPENING)
+    if sample_rate not in SAMPLE_RATES:
+        raise LiveSessionError(f"Unsupported sample rate {sample_rate}")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            user = await authenticate_token(token, db)
+        except HTTPException as e:
+            raise LiveSessionError(e.detail)
+        if not await question_cache.get_question(db, question_id):
+            raise LiveSessionError("Question not found")
+    return user, question_id, sample_rate
+
+
+# Live recording protocol: the client sends {"token", "question_id", "sample_rate"} as JSON, then
+# binary frames of mono 16-bit little-endian PCM while the user speaks, then {"type": "stop"}.
+# The server answers {"type": "ready"}, then {"type": "segment", "index", "text"} as each segment
+# is transcribed, and finally {"type": "queued", "attempt_id", "transcript"} before closing.
+@router.websocket("/live")
+async def live_attempt(websocket: WebSocket):
+    """Record an answer over a WebSocket, transcribing it in segments while the user speaks"""
+    await websocket.accept()
+    send_lock = asyncio.Lock()
+
+    async def send(message: dict) -> None:
+        async with send_lock:
+            await websocket.send_json(message)
+
+    async def on_segment(index: int, text: str) -> None:
+        try:
+            await send({"type": "segment", "index": index, "text": text})
+        except Exception:
+            pass  # Client went away; finish() or abort() still runs
+
+    async def reject(detail: str, code: int) -> None:
+        try:
+            await send({"type": "error", "detail": detail})
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+    try:
+        opening = json.loads(await asyncio.wait_for(websocket.receive_text(), timeout=LIVE_IDLE_TIMEOUT))
+        user, question_id, sample_rate = await _start_live(opening if isinstance(opening, dict) else {})
+    except (asyncio.TimeoutError, json.JSONDecodeError, KeyError):
+        await reject(LIVE_OPENING, 1008)
+        return
+    except LiveSessionError as e:
+        await reject(e.detail, e.code)
+        return
+    except WebSocketDisconnect:
+        return
+
+    session = LiveSession(sample_rate, on_segment)
+    await session.open()
+    await send({"type": "ready"})
+    try:
+        while True:
+            message = await asyncio.wait_for(websocket.receive(), timeout=LIVE_IDLE_TIMEOUT)
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            if message.get("bytes"):
+                await session.feed(message["bytes"])
+            elif message.get("text") and _control_type(message["text"]) == "stop":
+                break
+        if session.size == 0:
+            raise LiveSessionError("No audio received")
+        stored, transcript = await session.finish()
+    except WebSocketDisconnect:
+        session.abort()
+        return
+    except asyncio.TimeoutError:
+        session.abort()
+        await reject(f"No audio for {LIVE_IDLE_TIMEOUT:.0f}s", 1008)
+        return
+    except UploadTooLarge as e:
+        session.abort()
+        await reject(f"Audio exceeds the {e.limit} byte limit", 1009)
+        return
+    except LiveSessionError as e:
+        session.abort()
+        await reject(e.detail, e.code)
+        return
+    except BaseException:
+        session.abort()
+        raise
+
+    # Transcript already filled in (unless a segment failed), so the worker goes straight to evaluation
+    async with AsyncSessionLocal() as db:
+        new_attempt = Attempt(
+            user_id=user.id,
+            question_id=question_id,
+            audio_url=stored.path,
+            audio_hash=stored.sha256,
+            audio_bytes=stored.size,
+            audio_seconds=session.size / 2 / sample_rate,
+            transcript=transcript,
+            status="queued"
         )
-        new_attempt.score = evaluation.get("overall_score")
-        new_attempt.feedback = evaluation
-        db.commit()
-        db.refresh(new_attempt)
-    except Exception as e:
-        # Log error but don't fail the request
-        print(f"Processing error: {str(e)}")
-        db.commit()
-        db.refresh(new_attempt)
+        db.add(new_attempt)
+        await db.commit()
+        attempt_id = new_attempt.id
+    notify_workers()
 
-    return new_attempt
+    try:
+        await send({"type": "queued", "attempt_id": attempt_id, "transcript": transcript})
+        await websocket.close()
+    except Exception:
+        logger.info("Live client for attempt %s left before it was queued", attempt_id)
 
 
-@router.get("/", response_model=List[AttemptResponse])
-def get_user_attempts(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+@router.get("/", response_model=List[AttemptListItem])
+async def get_user_attempts(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None, description="Comma-separated extra fields, e.g. transcript,feedback"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all attempts for the current user"""
-    attempts = db.query(Attempt).filter(Attempt.user_id == current_user.id).all()
-    return attempts
+    """Get summaries of the current user's attempts newest first; follow X-Next-Cursor for more"""
+    names = SUMMARY_FIELDS + tuple(_parse_fields(fields))
+    query = select(Attempt).options(
+        load_only(*(getattr(Attempt, name) for name in names))
+    ).where(Attempt.user_id == current_user.id)
+    try:
+        attempts, next_cursor = await keyset_page_async(db, query, Attempt, cursor, limit, descending=True)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    # Plain dicts so serialization never touches (and lazily loads) an unselected column
+    return fast_json([{name: getattr(attempt, name) for name in names} for attempt in attempts], response)
 
 
 @router.get("/{attempt_id}", response_model=AttemptResponse)
-def get_attempt(
+async def get_attempt(
     attempt_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific attempt"""
-    attempt = db.query(Attempt).filter(Attempt.id == attempt_id).first()
+    attempt = await db.scalar(select(Attempt).where(Attempt.id == attempt_id))
     if not attempt:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,3 +264,58 @@ def get_attempt(
         )
 
     return attempt
+
+
+@router.get("/{attempt_id}/status", response_model=AttemptStatusResponse)
+async def get_attempt_status(
+    attempt_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Poll the processing status of an attempt"""
+    attempt = (await db.execute(
+        select(Attempt.id, Attempt.user_id, Attempt.status, Attempt.stage, Attempt.error, Attempt.score)
+        .where(Attempt.id == attempt_id)
+    )).first()
+    if not attempt:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Attempt not found"
+        )
+
+    if attempt.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this attempt"
+        )
+
+    return attempt
+
+
+@router.get("/{attempt_id}/stream")
+async def stream_attempt(
+    attempt_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream status changes and feedback as it is generated (Server-Sent Events)"""
+    owner_id = await db.scalar(select(Attempt.user_id).where(Attempt.id == attempt_id))
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Attempt not found"
+        )
+
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this attempt"
+        )
+
+    # The stream can stay open for minutes; give the connection back now
+    await db.rollback()
+    return StreamingResponse(
+        events.stream_attempt(attempt_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
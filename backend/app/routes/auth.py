@@ -1,56 +1,99 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from ..database import get_db
-from ..models import User
+from typing import Optional
+from ..database import get_async_db
+from ..models import User, UserStats
 from ..schemas import UserCreate, UserLogin, UserResponse, Token
-from ..auth import get_password_hash, verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
-from ..dependencies import get_current_user
+from ..auth import (get_password_hash_async, verify_password_async, create_access_token,
+                    PasswordHasherBusy, ACCESS_TOKEN_EXPIRE_MINUTES)
+from ..dependencies import get_current_user, AuthenticatedUser
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _already_registered(db: AsyncSession, user_data: UserCreate) -> Optional[HTTPException]:
+    """The 400 to return if the email or username is taken, else None"""
+    existing_user = (await db.scalars(select(User).where(
+        (User.email == user_data.email) | (User.username == user_data.username)
+    ).limit(1))).first()
+
+    if existing_user is None:
+        return None
+    if existing_user.email == user_data.email:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Username already taken"
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(User).filter(
-        (User.email == user_data.email) | (User.username == user_data.username)
-    ).first()
-
-    if existing_user:
-        if existing_user.email == user_data.email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already taken"
-            )
-
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    taken = await _already_registered(db, user_data)
+    if taken:
+        raise taken
+
+    # Create new user; hand the connection back to the pool while bcrypt runs
+    await db.rollback()
+    try:
+        hashed_password = await get_password_hash_async(user_data.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     new_user = User(
         username=user_data.username,
         email=user_data.email,
         password_hash=hashed_password
     )
 
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    try:
+        db.add(new_user)
+        await db.flush()
+        db.add(UserStats(user_id=new_user.id, sum_score=0, scored_attempts=0))
+        await db.commit()
+    except IntegrityError:
+        # A concurrent registration took the email or username after the check above
+        await db.rollback()
+        taken = await _already_registered(db, user_data)
+        raise taken or HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email or username already registered"
+        )
+    await db.refresh(new_user)
 
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login and get access token"""
-    user = db.query(User).filter(User.email == user_data.email).first()
+    user = (await db.execute(
+        select(User.id, User.password_hash).where(User.email == user_data.email).limit(1)
+    )).first()
+    # Don't hold a pooled connection while waiting on bcrypt
+    await db.close()
+
+    try:
+        valid = user is not None and await verify_password_async(user_data.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
 
-    if not user or not verify_password(user_data.password, user.password_hash):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -59,13 +102,13 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.id}, expires_delta=access_token_expires
+        data={"sub": str(user.id)}, expires_delta=access_token_expires
     )
 
     return {"access_token": access_token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: AuthenticatedUser = Depends(get_current_user)):
     """Get current user info"""
     return current_user
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import Friendship, User
 from ..schemas.friendship import FriendshipCreate, FriendshipResponse
 from ..schemas.user import UserResponse
-from ..dependencies import get_current_user
+from ..dependencies import get_current_user, AuthenticatedUser
 
 router = APIRouter(prefix="/friends", tags=["friends"])
 
@@ -13,7 +16,7 @@ router = APIRouter(prefix="/friends", tags=["friends"])
 @router.post("/request", response_model=FriendshipResponse, status_code=status.HTTP_201_CREATED)
 def send_friend_request(
     friendship_data: FriendshipCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Send a friend request"""
@@ -43,7 +46,15 @@ def send_friend_request(
         status="pending"
     )
     db.add(new_friendship)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost a race with an identical concurrent request
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Friend request already exists or you are already friends"
+        )
     db.refresh(new_friendship)
     return new_friendship
 
@@ -51,7 +62,7 @@ def send_friend_request(
 @router.post("/{friendship_id}/accept", response_model=FriendshipResponse)
 def accept_friend_request(
     friendship_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Accept a friend request"""
@@ -75,15 +86,15 @@ def accept_friend_request(
 
 
 @router.get("/", response_model=List[UserResponse])
-def get_friends(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_friends(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all accepted friends"""
-    friendships = db.query(Friendship).filter(
+    friendships = (await db.scalars(select(Friendship).where(
         ((Friendship.user_id == current_user.id) | (Friendship.friend_id == current_user.id)) &
         (Friendship.status == "accepted")
-    ).all()
+    ))).all()
 
     friend_ids = []
     for f in friendships:
@@ -92,18 +103,18 @@ def get_friends(
         else:
             friend_ids.append(f.user_id)
 
-    friends = db.query(User).filter(User.id.in_(friend_ids)).all()
+    friends = (await db.scalars(select(User).where(User.id.in_(friend_ids)))).all()
     return friends
 
 
 @router.get("/requests", response_model=List[FriendshipResponse])
-def get_friend_requests(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_friend_requests(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get pending friend requests"""
-    requests = db.query(Friendship).filter(
+    requests = (await db.scalars(select(Friendship).where(
         (Friendship.friend_id == current_user.id) &
         (Friendship.status == "pending")
-    ).all()
+    ))).all()
     return requests
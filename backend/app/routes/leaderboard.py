@@ -1,58 +1,88 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-from ..database import get_db
-from ..models import Attempt, User, Friendship
-from ..schemas.friendship import LeaderboardEntry
-from ..dependencies import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ..database import get_read_db
+from ..models import User, Friendship, UserStats
+from ..schemas.friendship import (LeaderboardEntry, RankedLeaderboardEntry,
+                                  LeaderboardPosition, LeaderboardPage)
+from ..dependencies import get_current_user, AuthenticatedUser
+from ..pagination import encode_cursor, decode_cursor
+from ..services.ranking import rank_index
+from ..services.versions import LEADERBOARD
+from ..http_cache import versioned
+from ..responses import fast_json
 
 router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
 
 
-@router.get("/global", response_model=List[LeaderboardEntry])
-def get_global_leaderboard(
-    limit: int = 10,
-    db: Session = Depends(get_db)
-):
-    """Get global leaderboard of all users"""
-    leaderboard = db.query(
+def _leaderboard_query():
+    """Users with at least one scored attempt, best average first (served from user_stats)"""
+    return select(
         User.id.label("user_id"),
         User.username,
-        func.avg(Attempt.score).label("average_score"),
-        func.count(Attempt.id).label("total_attempts")
+        UserStats.avg_score.label("average_score"),
+        UserStats.scored_attempts.label("total_attempts")
     ).join(
-        Attempt, User.id == Attempt.user_id
-    ).filter(
-        Attempt.score.isnot(None)
-    ).group_by(
-        User.id, User.username
+        UserStats, User.id == UserStats.user_id
+    ).where(
+        UserStats.avg_score.isnot(None)
     ).order_by(
-        func.avg(Attempt.score).desc()
-    ).limit(limit).all()
+        UserStats.avg_score.desc(), UserStats.user_id
+    )
 
+
+async def _ranked_entries(db: AsyncSession, window) -> List[RankedLeaderboardEntry]:
+    """Attach usernames to (rank, user_id, avg_score, scored_attempts) tuples from the rank index"""
+    user_ids = [user_id for _, user_id, _, _ in window]
+    usernames = {}
+    if user_ids:
+        usernames = dict((await db.execute(
+            select(User.id, User.username).where(User.id.in_(user_ids))
+        )).all())
     return [
-        LeaderboardEntry(
-            user_id=entry.user_id,
-            username=entry.username,
-            average_score=round(entry.average_score, 2),
-            total_attempts=entry.total_attempts
+        RankedLeaderboardEntry(
+            rank=rank,
+            user_id=user_id,
+            username=usernames.get(user_id, ""),
+            average_score=round(avg_score, 2),
+            total_attempts=scored_attempts
         )
-        for entry in leaderboard
+        for rank, user_id, avg_score, scored_attempts in window
     ]
 
 
+@router.get("/global", response_model=List[LeaderboardEntry], dependencies=[Depends(versioned(LEADERBOARD))])
+async def get_global_leaderboard(
+    response: Response,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get global leaderboard of all users"""
+    leaderboard = (await db.execute(_leaderboard_query().limit(limit))).all()
+
+    return fast_json([
+        {
+            "user_id": entry.user_id,
+            "username": entry.username,
+            "average_score": round(entry.average_score, 2),
+            "total_attempts": entry.total_attempts
+        }
+        for entry in leaderboard
+    ], response)
+
+
 @router.get("/friends", response_model=List[LeaderboardEntry])
-def get_friends_leaderboard(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_friends_leaderboard(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get leaderboard of friends only"""
     # Get friend IDs
-    friendships = db.query(Friendship).filter(
+    friendships = (await db.scalars(select(Friendship).where(
         ((Friendship.user_id == current_user.id) | (Friendship.friend_id == current_user.id)) &
         (Friendship.status == "accepted")
-    ).all()
+    ))).all()
 
     friend_ids = [current_user.id]  # Include self
     for f in friendships:
@@ -61,21 +91,9 @@ def get_friends_leaderboard(
         else:
             friend_ids.append(f.user_id)
 
-    leaderboard = db.query(
-        User.id.label("user_id"),
-        User.username,
-        func.avg(Attempt.score).label("average_score"),
-        func.count(Attempt.id).label("total_attempts")
-    ).join(
-        Attempt, User.id == Attempt.user_id
-    ).filter(
-        User.id.in_(friend_ids),
-        Attempt.score.isnot(None)
-    ).group_by(
-        User.id, User.username
-    ).order_by(
-        func.avg(Attempt.score).desc()
-    ).all()
+    leaderboard = (await db.execute(_leaderboard_query().where(
+        UserStats.user_id.in_(friend_ids)
+    ))).all()
 
     return [
         LeaderboardEntry(
@@ -86,3 +104,59 @@ def get_friends_leaderboard(
         )
         for entry in leaderboard
     ]
+
+
+@router.get("/global/window", response_model=LeaderboardPage)
+async def get_leaderboard_window(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Page through the full global ranking using an opaque cursor"""
+    await rank_index.ensure_loaded(db)
+
+    start = 0
+    if cursor:
+        try:
+            avg_score, user_id = decode_cursor(cursor)
+            start = rank_index.position_after(float(avg_score), int(user_id))
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    window = rank_index.window(start, limit)
+    next_cursor = None
+    if len(window) == limit and start + limit < len(rank_index):
+        _, last_user_id, last_avg_score, _ = window[-1]
+        next_cursor = encode_cursor([last_avg_score, last_user_id])
+
+    return LeaderboardPage(items=await _ranked_entries(db, window), next_cursor=next_cursor)
+
+
+@router.get("/me", response_model=LeaderboardPosition)
+async def get_my_position(
+    neighbors: int = Query(2, ge=0, le=25),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the current user's global rank along with the users around them"""
+    await rank_index.ensure_loaded(db)
+
+    rank = rank_index.rank(current_user.id)
+    if rank is None:
+        return LeaderboardPosition(
+            rank=None, total_ranked=len(rank_index), entry=None, above=[], below=[]
+        )
+
+    start = max(rank - 1 - neighbors, 0)
+    entries = await _ranked_entries(db, rank_index.window(start, rank - start + neighbors))
+    position = rank - 1 - start
+    return LeaderboardPosition(
+        rank=rank,
+        total_ranked=len(rank_index),
+        entry=entries[position],
+        above=entries[:position],
+        below=entries[position + 1:]
+    )
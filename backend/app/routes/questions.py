@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from ..database import get_db
-from ..models import Question, User
-from ..schemas import QuestionCreate, QuestionUpdate, QuestionResponse
-from ..dependencies import get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Callable, List, Optional
+from ..database import get_async_db, get_read_db
+from ..models import Question
+from ..schemas import QuestionCreate, QuestionUpdate, QuestionResponse, QuestionSearchResult
+from ..dependencies import get_current_user, AuthenticatedUser
+from ..pagination import NEXT_CURSOR_HEADER
+from ..services import question_cache
+from ..services.search import search_questions
+from ..services.versions import QUESTIONS, bump_version_async
+from ..http_cache import versioned
+from ..responses import fast_json
 
 router = APIRouter(prefix="/questions", tags=["questions"])
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 200
+
 
 @router.post("/", response_model=QuestionResponse, status_code=status.HTTP_201_CREATED)
-def create_question(
+async def create_question(
     question_data: QuestionCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new question"""
     new_question = Question(
@@ -23,47 +33,71 @@ def create_question(
         category=question_data.category
     )
     db.add(new_question)
-    db.commit()
-    db.refresh(new_question)
+    await bump_version_async(db, QUESTIONS)
+    await db.commit()
+    await db.refresh(new_question)
+    question_cache.invalidate()
     return new_question
 
 
-@router.get("/", response_model=List[QuestionResponse])
-def get_questions(
-    skip: int = 0,
-    limit: int = 100,
+@router.get("/", response_model=List[QuestionResponse], dependencies=[Depends(versioned(QUESTIONS))])
+async def get_questions(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     category: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get questions oldest first with optional filtering; follow X-Next-Cursor for more"""
+    try:
+        questions, next_cursor = await question_cache.get_page(db, category, cursor, limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return fast_json(questions, response)
+
+
+@router.get("/search", response_model=List[QuestionSearchResult])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """Get all questions with optional filtering"""
-    query = db.query(Question)
-    if category:
-        query = query.filter(Question.category == category)
-    questions = query.offset(skip).limit(limit).all()
-    return questions
+    """Full-text search over question titles and descriptions, best matches first"""
+    return fast_json(await search_questions(db, q, limit), response)
 
 
 @router.get("/{question_id}", response_model=QuestionResponse)
-def get_question(question_id: int, db: Session = Depends(get_db)):
+async def get_question(
+    question_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    not_modified: Callable[[], None] = Depends(versioned(QUESTIONS, deferred=True))
+):
     """Get a specific question by ID"""
-    question = db.query(Question).filter(Question.id == question_id).first()
+    question = await question_cache.get_question(db, question_id)
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question not found"
         )
+    not_modified()
     return question
 
 
 @router.put("/{question_id}", response_model=QuestionResponse)
-def update_question(
+async def update_question(
     question_id: int,
     question_data: QuestionUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a question (only creator can update)"""
-    question = db.query(Question).filter(Question.id == question_id).first()
+    question = await db.scalar(select(Question).where(Question.id == question_id))
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -83,19 +117,21 @@ def update_question(
     if question_data.category is not None:
         question.category = question_data.category
 
-    db.commit()
-    db.refresh(question)
+    await bump_version_async(db, QUESTIONS)
+    await db.commit()
+    await db.refresh(question)
+    question_cache.invalidate(question_id)
     return question
 
 
 @router.delete("/{question_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_question(
+async def delete_question(
     question_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a question (only creator can delete)"""
-    question = db.query(Question).filter(Question.id == question_id).first()
+    question = await db.scalar(select(Question).where(Question.id == question_id))
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -108,6 +144,8 @@ def delete_question(
             detail="Not authorized to delete this question"
         )
 
-    db.delete(question)
-    db.commit()
+    await db.delete(question)
+    await bump_version_async(db, QUESTIONS)
+    await db.commit()
+    question_cache.invalidate(question_id)
     return None
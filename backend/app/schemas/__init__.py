@@ -1,9 +1,15 @@
 from .user import UserCreate, UserLogin, UserResponse, Token, TokenData
-from .question import QuestionCreate, QuestionUpdate, QuestionResponse
-from .attempt import AttemptCreate, AttemptResponse
-from .friendship import FriendshipCreate, FriendshipResponse, LeaderboardEntry
+from .question import QuestionCreate, QuestionUpdate, QuestionResponse, QuestionSearchResult
+from .attempt import (AttemptCreate, AttemptResponse, AttemptStatusResponse,
+                      AttemptSummary, AttemptListItem)
+from .friendship import (FriendshipCreate, FriendshipResponse, LeaderboardEntry,
+                         RankedLeaderboardEntry, LeaderboardPosition, LeaderboardPage)
+from .evaluation import RubricScores, Rubric
 
 __all__ = ["UserCreate", "UserLogin", "UserResponse", "Token", "TokenData",
-           "QuestionCreate", "QuestionUpdate", "QuestionResponse",
-           "AttemptCreate", "AttemptResponse",
-           "FriendshipCreate", "FriendshipResponse", "LeaderboardEntry"]
+           "QuestionCreate", "QuestionUpdate", "QuestionResponse", "QuestionSearchResult",
+           "AttemptCreate", "AttemptResponse", "AttemptStatusResponse",
+           "AttemptSummary", "AttemptListItem",
+           "FriendshipCreate", "FriendshipResponse", "LeaderboardEntry",
+           "RankedLeaderboardEntry", "LeaderboardPosition", "LeaderboardPage",
+           "RubricScores", "Rubric"]
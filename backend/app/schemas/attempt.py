@@ -15,7 +15,50 @@ class AttemptResponse(BaseModel):
     transcript: Optional[str]
     score: Optional[float]
     feedback: Optional[Dict[str, Any]]
+    status: str
+    stage: Optional[str]
+    error: Optional[str]
+    audio_bytes: Optional[int] = None
+    audio_seconds: Optional[float] = None
+    processed_bytes: Optional[int] = None
+    speech_seconds: Optional[float] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class AttemptStatusResponse(BaseModel):
+    id: int
+    status: str
+    stage: Optional[str]
+    error: Optional[str]
+    score: Optional[float]
+
+    class Config:
+        from_attributes = True
+
+
+class AttemptSummary(BaseModel):
+    id: int
+    question_id: int
+    score: Optional[float]
+    status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class AttemptListItem(AttemptSummary):
+    """Summary plus whichever heavier fields were requested with `fields=`"""
+    user_id: Optional[int] = None
+    audio_url: Optional[str] = None
+    transcript: Optional[str] = None
+    feedback: Optional[Dict[str, Any]] = None
+    stage: Optional[str] = None
+    error: Optional[str] = None
+    audio_bytes: Optional[int] = None
+    audio_seconds: Optional[float] = None
+    processed_bytes: Optional[int] = None
+    speech_seconds: Optional[float] = None
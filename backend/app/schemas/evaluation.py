@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class RubricScores(BaseModel):
+    framework: int = Field(ge=1, le=10, description="Did they use a clear framework or structured approach?")
+    clarity: int = Field(ge=1, le=10, description="Was the answer clear and easy to follow?")
+    depth: int = Field(ge=1, le=10, description="Did they provide sufficient detail and depth in their analysis?")
+    user_focus: int = Field(ge=1, le=10, description="Did they demonstrate understanding of user needs?")
+    business_acumen: int = Field(ge=1, le=10, description="Did they show business/product sense?")
+
+
+class Rubric(BaseModel):
+    """Scores and feedback for one answer; the overall score is computed from the scores, not asked for"""
+
+    scores: RubricScores
+    strengths: List[str] = Field(description="What the answer did well")
+    improvements: List[str] = Field(description="Areas for improvement")
+    summary: str = Field(min_length=1, description="Brief 2-3 sentence summary of the answer quality")
+
+    @property
+    def overall_score(self) -> float:
+        values = self.scores.model_dump().values()
+        return round(sum(values) / len(values), 1)
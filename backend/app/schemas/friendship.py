@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import List, Optional
 
 
 class FriendshipCreate(BaseModel):
@@ -22,3 +23,20 @@ class LeaderboardEntry(BaseModel):
     username: str
     average_score: float
     total_attempts: int
+
+
+class RankedLeaderboardEntry(LeaderboardEntry):
+    rank: int
+
+
+class LeaderboardPosition(BaseModel):
+    rank: Optional[int]
+    total_ranked: int
+    entry: Optional[RankedLeaderboardEntry]
+    above: List[RankedLeaderboardEntry]
+    below: List[RankedLeaderboardEntry]
+
+
+class LeaderboardPage(BaseModel):
+    items: List[RankedLeaderboardEntry]
+    next_cursor: Optional[str]
@@ -25,3 +25,8 @@ class QuestionResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class QuestionSearchResult(QuestionResponse):
+    rank: float
+    snippet: str
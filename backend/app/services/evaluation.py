@@ -1,17 +1,24 @@
-import os
 import json
-from anthropic import Anthropic
+import hashlib
+import os
+import time
+from typing import Any, Callable, Optional
 from dotenv import load_dotenv
+from pydantic import ValidationError
+from .. import metrics
+from ..schemas.evaluation import Rubric
+from .providers import get_anthropic_client, anthropic_slot
+from .resilience import call_provider
 
 load_dotenv()
 
-client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-
+EVALUATION_MODEL = "claude-3-5-sonnet-20241022"
+# Cheaper model that fixes up an evaluation which does not fit the rubric schema (empty = give up instead)
+EVALUATION_REPAIR_MODEL = os.getenv("EVALUATION_REPAIR_MODEL", "claude-3-5-haiku-20241022")
 
-async def evaluate_pm_answer(question_title: str, question_description: str, transcript: str) -> dict:
-    """Evaluate a PM interview answer using Claude"""
+TOOL_NAME = "record_evaluation"
 
-    prompt = f"""You are an experienced product management interviewer evaluating a candidate's answer to a PM interview question.
+PROMPT_TEMPLATE = """You are an experienced product management interviewer evaluating a candidate's answer to a PM interview question.
 
 Question: {question_title}
 Description: {question_description}
@@ -26,47 +33,205 @@ Please evaluate this answer on the following criteria (score each out of 10):
 4. User Focus - Did they demonstrate understanding of user needs?
 5. Business Acumen - Did they show business/product sense?
 
-Provide your evaluation in JSON format with the following structure:
-{{
-    "scores": {{
-        "framework": <score 1-10>,
-        "clarity": <score 1-10>,
-        "depth": <score 1-10>,
-        "user_focus": <score 1-10>,
-        "business_acumen": <score 1-10>
-    }},
-    "overall_score": <average score>,
-    "strengths": ["strength 1", "strength 2", ...],
-    "improvements": ["area for improvement 1", "area for improvement 2", ...],
-    "summary": "Brief 2-3 sentence summary of the answer quality"
-}}
+Record your evaluation with the {tool_name} tool.
 
 Be constructive but honest in your feedback."""
 
+
+def _inline_refs(schema: dict) -> dict:
+    """Pydantic's JSON schema with $ref pointers replaced by the definitions they name"""
+    definitions = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(definitions[node["$ref"].rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(item) for item in node]
+        return node
+
+    return resolve(schema)
+
+
+TOOL = {
+    "name": TOOL_NAME,
+    "description": "Record the scores and feedback for the candidate's answer",
+    "input_schema": _inline_refs(Rubric.model_json_schema()),
+}
+
+# Changes whenever the rubric prompt, schema or model changes, invalidating cached evaluations
+PROMPT_VERSION = hashlib.sha256(
+    f"{EVALUATION_MODEL}\n{PROMPT_TEMPLATE}\n{json.dumps(TOOL, sort_keys=True)}".encode()
+).hexdigest()[:12]
+
+REPAIR_PROMPT = """An interviewer's evaluation of a candidate's answer did not match the required format.
+
+Evaluation:
+{output}
+
+Problems:
+{errors}
+
+Call the {tool_name} tool with this same evaluation, changing only what is needed to fix the problems. \
+Do not re-grade the answer."""
+
+# Per-attempt timeout and overall deadline (seconds) for one evaluation, retries included
+EVALUATION_TIMEOUT = float(os.getenv("EVALUATION_TIMEOUT", "60"))
+EVALUATION_DEADLINE = float(os.getenv("EVALUATION_DEADLINE", "180"))
+# Send a duplicate request if the first has not answered after this many seconds (0 = off)
+EVALUATION_HEDGE_AFTER = float(os.getenv("EVALUATION_HEDGE_AFTER", "0")) or None
+# Use the Messages streaming API when a caller wants incremental feedback (0 = always wait for the full message)
+EVALUATION_STREAMING = os.getenv("EVALUATION_STREAMING", "1") == "1"
+
+
+class EvaluationParseError(ValueError):
+    """Claude answered, but not with an evaluation that fits the rubric schema, even after repair"""
+
+
+def _parse_failure_rate() -> float:
+    parsed = metrics.value("evaluation.parsed")
+    failures = metrics.value("evaluation.parse_failures")
+    return round(failures / (parsed + failures), 3) if parsed + failures else 0.0
+
+
+metrics.register_gauge("evaluation.parse_failure_rate", _parse_failure_rate)
+
+
+def _tool_input(message) -> Any:
+    """The rubric Claude recorded, or failing that any JSON it wrote as text"""
+    text = ""
+    for block in message.content:
+        if block.type == "tool_use" and block.name == TOOL_NAME:
+            return block.input
+        if block.type == "text":
+            text += block.text
+    # Without a tool call, fall back to prose JSON, possibly wrapped in a markdown fence
+    if "```" in text:
+        start = text.find("\n", text.find("```")) + 1
+        text = text[start:text.find("```", start)]
     try:
-        message = client.messages.create(
-            model="claude-3-5-sonnet-20241022",
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def _validate(output: Any) -> dict:
+    """The stored form of a valid rubric, with the overall score computed from the five dimensions"""
+    rubric = Rubric.model_validate(output)
+    return {
+        "scores": rubric.scores.model_dump(),
+        "overall_score": rubric.overall_score,
+        "strengths": rubric.strengths,
+        "improvements": rubric.improvements,
+        "summary": rubric.summary,
+    }
+
+
+async def _repair(output: Any, error: ValidationError) -> dict:
+    """Ask the repair model to make an invalid evaluation fit the schema, without the transcript or re-grading"""
+    metrics.incr("evaluation.repair_calls")
+    prompt = REPAIR_PROMPT.format(
+        output=output if isinstance(output, str) else json.dumps(output, indent=2),
+        errors="\n".join(f"- {'.'.join(map(str, e['loc'])) or 'evaluation'}: {e['msg']}" for e in error.errors()),
+        tool_name=TOOL_NAME
+    )
+
+    async def request():
+        return await get_anthropic_client().messages.create(
+            model=EVALUATION_REPAIR_MODEL,
             max_tokens=1024,
+            tools=[TOOL],
+            tool_choice={"type": "tool", "name": TOOL_NAME},
             messages=[
                 {"role": "user", "content": prompt}
             ]
         )
 
-        # Parse the JSON response
-        response_text = message.content[0].text
+    message = await call_provider(
+        "anthropic",
+        request,
+        slot=anthropic_slot(),
+        timeout=EVALUATION_TIMEOUT,
+        deadline=EVALUATION_DEADLINE,
+        hedge_after=EVALUATION_HEDGE_AFTER
+    )
+    return _validate(_tool_input(message))
 
-        # Extract JSON from the response (Claude might wrap it in markdown)
-        if "```json" in response_text:
-            json_start = response_text.find("```json") + 7
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
-        elif "```" in response_text:
-            json_start = response_text.find("```") + 3
-            json_end = response_text.find("```", json_start)
-            response_text = response_text[json_start:json_end].strip()
 
-        evaluation = json.loads(response_text)
-        return evaluation
+async def evaluate_pm_answer(
+    question_title: str,
+    question_description: str,
+    transcript: str,
+    on_text: Optional[Callable[[str], None]] = None
+) -> dict:
+    """Evaluate a PM interview answer using Claude, reporting the rubric JSON generated so far to `on_text`"""
 
-    except Exception as e:
-        raise Exception(f"Evaluation failed: {str(e)}")
+    prompt = PROMPT_TEMPLATE.format(
+        question_title=question_title,
+        question_description=question_description,
+        transcript=transcript,
+        tool_name=TOOL_NAME
+    )
+    streaming = on_text is not None and EVALUATION_STREAMING
+
+    async def request():
+        return await get_anthropic_client().messages.create(
+            model=EVALUATION_MODEL,
+            max_tokens=1024,
+            tools=[TOOL],
+            tool_choice={"type": "tool", "name": TOOL_NAME},
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+
+    async def stream_request():
+        started = time.monotonic()
+        text = ""
+        async with get_anthropic_client().messages.stream(
+            model=EVALUATION_MODEL,
+            max_tokens=1024,
+            tools=[TOOL],
+            tool_choice={"type": "tool", "name": TOOL_NAME},
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        ) as stream:
+            async for event in stream:
+                if event.type != "input_json" or not event.partial_json:
+                    continue
+                if not text:
+                    metrics.observe("evaluation.first_token_ms", (time.monotonic() - started) * 1000)
+                # Whole text rather than deltas, so a retried call naturally starts over
+                text += event.partial_json
+                on_text(text)
+            return await stream.get_final_message()
+
+    message = await call_provider(
+        "anthropic",
+        stream_request if streaming else request,
+        slot=anthropic_slot(),
+        timeout=EVALUATION_TIMEOUT,
+        deadline=EVALUATION_DEADLINE,
+        # Two hedged streams would interleave their text, so streaming calls are never hedged
+        hedge_after=None if streaming else EVALUATION_HEDGE_AFTER
+    )
+
+    output = _tool_input(message)
+    try:
+        evaluation = _validate(output)
+    except ValidationError as e:
+        metrics.incr("evaluation.parse_failures")
+        # With nothing to fix, a repair would have to invent the evaluation
+        if not EVALUATION_REPAIR_MODEL or not output:
+            raise EvaluationParseError(f"Evaluation did not match the rubric: {e}") from e
+        try:
+            evaluation = await _repair(output, e)
+        except ValidationError as repair_error:
+            metrics.incr("evaluation.repair_failures")
+            raise EvaluationParseError(f"Evaluation did not match the rubric, even after repair: {e}") from repair_error
+        metrics.incr("evaluation.repaired")
+        return evaluation
+    metrics.incr("evaluation.parsed")
+    return evaluation
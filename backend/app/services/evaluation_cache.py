@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from dotenv import load_dotenv
+from .. import metrics
+from ..cache import LRUCache
+from ..models import EvaluationCache
+from .evaluation import EVALUATION_MODEL, PROMPT_VERSION
+
+load_dotenv()
+
+EVALUATION_CACHE_SIZE = int(os.getenv("EVALUATION_CACHE_SIZE", "1024"))
+
+# Front tier; the evaluation_cache table is the shared, persistent back tier
+_memory = LRUCache(maxsize=EVALUATION_CACHE_SIZE)
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Collapse whitespace so formatting-only differences share a cache entry"""
+    return " ".join(transcript.split())
+
+
+def evaluation_cache_key(question_title: str, question_description: str, transcript: str) -> str:
+    """Hash of everything that determines an evaluation result"""
+    payload = json.dumps([
+        question_title,
+        question_description,
+        normalize_transcript(transcript),
+        EVALUATION_MODEL,
+        PROMPT_VERSION,
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def get_cached_evaluation(db: Session, cache_key: str) -> Optional[dict]:
+    """Look up an evaluation in memory, then in the database"""
+    result = _memory.get(cache_key)
+    if result is not None:
+        metrics.incr("evaluation_cache.memory_hits")
+        return result
+
+    entry = db.query(EvaluationCache.result).filter(
+        EvaluationCache.cache_key == cache_key
+    ).first()
+    if entry is None:
+        metrics.incr("evaluation_cache.misses")
+        return None
+
+    metrics.incr("evaluation_cache.db_hits")
+    _memory.set(cache_key, entry.result)
+    return entry.result
+
+
+def store_evaluation(db: Session, cache_key: str, result: dict) -> None:
+    """Save an evaluation to both tiers; a concurrent insert of the same key is fine"""
+    _memory.set(cache_key, result)
+    db.add(EvaluationCache(
+        cache_key=cache_key,
+        model=EVALUATION_MODEL,
+        prompt_version=PROMPT_VERSION,
+        result=result
+    ))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
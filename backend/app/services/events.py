@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set, Tuple
+from sqlalchemy import select
+from dotenv import load_dotenv
+from .. import metrics
+from ..database import AsyncSessionLocal
+from ..models import Attempt
+
+load_dotenv()
+
+# Events buffered per subscriber before a slow reader is resynced with a snapshot
+ATTEMPT_EVENT_QUEUE_SIZE = int(os.getenv("ATTEMPT_EVENT_QUEUE_SIZE", "256"))
+# Idle streams re-read the attempt row this often, which also catches workers running in another
+# process, and send a keep-alive comment so proxies do not close the connection
+ATTEMPT_STREAM_POLL_SECONDS = float(os.getenv("ATTEMPT_STREAM_POLL_SECONDS", "5"))
+
+Event = Tuple[str, dict]
+
+_subscribers: Dict[int, Set[asyncio.Queue]] = {}
+# Feedback text generated so far for attempts being evaluated, so late subscribers can catch up
+_partial_feedback: Dict[int, str] = {}
+
+
+def _deliver(queue: asyncio.Queue, attempt_id: int, event: Event) -> None:
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # The reader fell behind: drop its backlog and send the whole text instead of the missed deltas
+        metrics.incr("attempt_events.resynced")
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(("feedback", {"text": _partial_feedback.get(attempt_id, ""), "reset": True}))
+        if event[0] != "feedback":
+            queue.put_nowait(event)
+
+
+def publish(attempt_id: int, event: str, data: dict) -> None:
+    """Send an event to everyone streaming this attempt in this process"""
+    if event in ("completed", "failed", "queued"):
+        _partial_feedback.pop(attempt_id, None)
+    for queue in _subscribers.get(attempt_id, ()):
+        _deliver(queue, attempt_id, (event, data))
+
+
+def publish_feedback(attempt_id: int, text: str) -> None:
+    """Publish the evaluation text generated so far as a delta, or as a reset if it restarted"""
+    previous = _partial_feedback.get(attempt_id, "")
+    _partial_feedback[attempt_id] = text
+    if text.startswith(previous):
+        if len(text) > len(previous):
+            publish(attempt_id, "feedback", {"text": text[len(previous):]})
+    else:
+        # A retried provider call starts over, so clients must discard what they have
+        publish(attempt_id, "feedback", {"text": text, "reset": True})
+
+
+def partial_feedback(attempt_id: int) -> Optional[str]:
+    """Evaluation text streamed so far, if this attempt is being evaluated in this process"""
+    return _partial_feedback.get(attempt_id)
+
+
+@asynccontextmanager
+async def subscribe(attempt_id: int) -> AsyncIterator[asyncio.Queue]:
+    """Queue receiving (event, data) tuples for one attempt until the block exits"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=ATTEMPT_EVENT_QUEUE_SIZE)
+    _subscribers.setdefault(attempt_id, set()).add(queue)
+    try:
+        yield queue
+    finally:
+        queues = _subscribers.get(attempt_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del _subscribers[attempt_id]
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _load_state(attempt_id: int):
+    # Short-lived session so an open stream never pins a pooled connection
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(
+            select(Attempt.status, Attempt.stage, Attempt.error, Attempt.score, Attempt.feedback)
+            .where(Attempt.id == attempt_id)
+        )).first()
+
+
+def _final_event(state) -> Optional[str]:
+    if state.status == "completed":
+        return _sse("completed", {"score": state.score, "feedback": state.feedback})
+    if state.status == "failed":
+        return _sse("failed", {"error": state.error})
+    return None
+
+
+async def stream_attempt(attempt_id: int) -> AsyncIterator[str]:
+    """Server-Sent Events for one attempt: status changes, feedback deltas, then completed or failed"""
+    metrics.incr("attempt_events.streams")
+    # Subscribe before reading the row so nothing published in between is missed; the partial
+    # text is taken in the same step so it neither overlaps nor misses the queued deltas
+    async with subscribe(attempt_id) as queue:
+        text = partial_feedback(attempt_id)
+        state = await _load_state(attempt_id)
+        if state is None:
+            return
+        seen = (state.status, state.stage)
+        yield _sse("status", {"status": state.status, "stage": state.stage})
+        final = _final_event(state)
+        if final is not None:
+            yield final
+            return
+        if text:
+            yield _sse("feedback", {"text": text, "reset": True})
+
+        while True:
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=ATTEMPT_STREAM_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                state = await _load_state(attempt_id)
+                if state is None:
+                    return
+                final = _final_event(state)
+                if final is not None:
+                    yield final
+                    return
+                if (state.status, state.stage) != seen:
+                    seen = (state.status, state.stage)
+                    yield _sse("status", {"status": state.status, "stage": state.stage})
+                else:
+                    yield ": keep-alive\n\n"
+                continue
+
+            if event in ("status", "queued"):
+                seen = (data["status"], data["stage"])
+                yield _sse("status", data)
+                continue
+            yield _sse(event, data)
+            if event in ("completed", "failed"):
+                return
@@ -0,0 +1,55 @@
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+from ..models import Attempt, User, UserStats
+from .ranking import rank_index
+from .versions import LEADERBOARD, bump_version
+
+
+def record_score(db: Session, user_id: int, score: float) -> None:
+    """Fold a new attempt score into the user's aggregates (caller commits)"""
+    # Single UPDATE so concurrent scorers cannot lose each other's increments;
+    # the right-hand sides see the pre-update values
+    updated = db.execute(
+        update(UserStats)
+        .where(UserStats.user_id == user_id)
+        .values(
+            sum_score=UserStats.sum_score + score,
+            scored_attempts=UserStats.scored_attempts + 1,
+            avg_score=(UserStats.sum_score + score) / (UserStats.scored_attempts + 1)
+        )
+    ).rowcount
+    if not updated:
+        db.add(UserStats(user_id=user_id, sum_score=score, scored_attempts=1, avg_score=score))
+    bump_version(db, LEADERBOARD)
+
+
+def sync_rank(db: Session, user_id: int) -> None:
+    """Push a user's committed aggregates into the in-process rank index"""
+    stats = db.query(UserStats.avg_score, UserStats.scored_attempts).filter(
+        UserStats.user_id == user_id
+    ).first()
+    if stats is not None:
+        rank_index.update(user_id, stats.avg_score, stats.scored_attempts)
+
+
+def rebuild_user_stats(db: Session) -> int:
+    """Recompute every user's aggregates from the attempts table; returns rows written"""
+    db.query(UserStats).delete(synchronize_session=False)
+    aggregates = select(
+        User.id,
+        func.coalesce(func.sum(Attempt.score), 0),
+        func.count(Attempt.score),
+        func.avg(Attempt.score)
+    ).select_from(User).outerjoin(
+        Attempt, User.id == Attempt.user_id
+    ).group_by(User.id)
+    db.execute(
+        insert(UserStats).from_select(
+            ["user_id", "sum_score", "scored_attempts", "avg_score"],
+            aggregates
+        )
+    )
+    bump_version(db, LEADERBOARD)
+    db.commit()
+    rank_index.invalidate()
+    return db.query(UserStats).count()
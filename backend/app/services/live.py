@@ -0,0 +1,184 @@
+import asyncio
+import io
+import logging
+import math
+import os
+import sys
+import time
+import wave
+from array import array
+from typing import Awaitable, Callable, List, Optional, Tuple
+from dotenv import load_dotenv
+from .. import metrics
+from . import storage
+from .storage import StoredUpload, UploadTooLarge
+from .transcription import transcribe_bytes
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Segments are cut at the first pause after LIVE_MIN_SEGMENT_SECONDS, and forcibly at the maximum
+LIVE_MIN_SEGMENT_SECONDS = float(os.getenv("LIVE_MIN_SEGMENT_SECONDS", "5"))
+LIVE_MAX_SEGMENT_SECONDS = float(os.getenv("LIVE_MAX_SEGMENT_SECONDS", "15"))
+# A pause is this much audio whose RMS level (16-bit samples) stays below LIVE_SILENCE_RMS
+LIVE_SILENCE_SECONDS = float(os.getenv("LIVE_SILENCE_SECONDS", "0.3"))
+LIVE_SILENCE_RMS = int(os.getenv("LIVE_SILENCE_RMS", "500"))
+# Close a live session that sends nothing for this many seconds
+LIVE_IDLE_TIMEOUT = float(os.getenv("LIVE_IDLE_TIMEOUT", "30"))
+
+SAMPLE_RATES = range(8000, 48001)
+_FRAME_SECONDS = 0.02
+
+
+class LiveSessionError(Exception):
+    """A live session that cannot continue; `code` is the WebSocket close code"""
+
+    def __init__(self, detail: str, code: int = 1008):
+        super().__init__(detail)
+        self.detail = detail
+        self.code = code
+
+
+def _rms(frame: bytes) -> float:
+    samples = array("h", frame)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return math.sqrt(sum(s * s for s in samples) / len(samples)) if samples else 0.0
+
+
+def wav_bytes(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap mono 16-bit PCM in a WAV container"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class Segmenter:
+    """Cuts a mono 16-bit PCM stream into segments at pauses, or at a fixed maximum length"""
+
+    def __init__(self, sample_rate: int):
+        self.frame_bytes = int(sample_rate * _FRAME_SECONDS) * 2
+        self.min_bytes = int(sample_rate * LIVE_MIN_SEGMENT_SECONDS) * 2
+        self.max_bytes = int(sample_rate * LIVE_MAX_SEGMENT_SECONDS) * 2
+        self.pause_frames = max(1, round(LIVE_SILENCE_SECONDS / _FRAME_SECONDS))
+        self.buffer = bytearray()
+        self.scanned = 0  # Bytes of the buffer already classified as speech or silence
+        self.silent_run = 0
+        self.voiced = False
+
+    def feed(self, pcm: bytes) -> List[Tuple[bytes, bool]]:
+        """Add audio; returns the (segment, contains_speech) pairs it completed"""
+        self.buffer += pcm
+        segments = []
+        while self.scanned + self.frame_bytes <= len(self.buffer):
+            frame = bytes(self.buffer[self.scanned:self.scanned + self.frame_bytes])
+            self.scanned += self.frame_bytes
+            if _rms(frame) < LIVE_SILENCE_RMS:
+                self.silent_run += 1
+            else:
+                self.silent_run = 0
+                self.voiced = True
+            paused = self.scanned >= self.min_bytes and self.silent_run >= self.pause_frames
+            if paused or self.scanned >= self.max_bytes:
+                segments.append(self._cut(self.scanned))
+        return segments
+
+    def flush(self) -> Optional[Tuple[bytes, bool]]:
+        """The trailing partial segment, if any"""
+        self.voiced = self.voiced or any(
+            _rms(bytes(self.buffer[i:i + self.frame_bytes])) >= LIVE_SILENCE_RMS
+            for i in range(self.scanned, len(self.buffer) - 1, self.frame_bytes)
+        )
+        return self._cut(len(self.buffer)) if self.buffer else None
+
+    def _cut(self, end: int) -> Tuple[bytes, bool]:
+        segment = (bytes(self.buffer[:end]), self.voiced)
+        del self.buffer[:end]
+        self.scanned = 0
+        self.silent_run = 0
+        self.voiced = False
+        return segment
+
+
+def _open_wav(path: str, sample_rate: int) -> wave.Wave_write:
+    w = wave.open(path, "wb")
+    w.setnchannels(1)
+    w.setsampwidth(2)
+    w.setframerate(sample_rate)
+    return w
+
+
+class LiveSession:
+    """One answer being recorded: saves the audio and transcribes its segments while it streams in"""
+
+    def __init__(self, sample_rate: int, on_segment: Callable[[int, str], Awaitable[None]]):
+        self.sample_rate = sample_rate
+        self.on_segment = on_segment
+        self.segmenter = Segmenter(sample_rate)
+        self.part_path = storage.new_part_path()
+        self.limit = min(storage.max_upload_bytes(), storage.MAX_AUDIO_SECONDS * sample_rate * 2)
+        self.size = 0
+        self.tasks: List[asyncio.Task] = []
+        self._wav: Optional[wave.Wave_write] = None
+
+    async def open(self) -> None:
+        self._wav = await asyncio.to_thread(_open_wav, self.part_path, self.sample_rate)
+        metrics.incr("live.sessions")
+
+    async def feed(self, pcm: bytes) -> None:
+        """Append audio, starting transcription of every segment it completes"""
+        if len(pcm) % 2:
+            raise LiveSessionError("Audio must be 16-bit PCM (an even number of bytes per message)")
+        self.size += len(pcm)
+        if self.size > self.limit:
+            raise UploadTooLarge(self.limit)
+        await asyncio.to_thread(self._wav.writeframesraw, pcm)
+        for segment, voiced in self.segmenter.feed(pcm):
+            self._start_segment(segment, voiced)
+
+    def _start_segment(self, pcm: bytes, voiced: bool) -> None:
+        if not voiced:
+            # Whisper invents words for silence, so pauses are not sent at all
+            metrics.incr("live.silent_segments")
+            return
+        index = len(self.tasks)
+        self.tasks.append(asyncio.create_task(self._transcribe(index, pcm)))
+
+    async def _transcribe(self, index: int, pcm: bytes) -> str:
+        metrics.incr("live.segments")
+        text = (await transcribe_bytes(wav_bytes(pcm, self.sample_rate), f"segment-{index}.wav")).strip()
+        await self.on_segment(index, text)
+        return text
+
+    async def finish(self) -> Tuple[StoredUpload, Optional[str]]:
+        """Store the whole recording and stitch the segment transcripts (None if any segment failed)"""
+        stopped = time.monotonic()
+        trailing = self.segmenter.flush()
+        if trailing is not None:
+            self._start_segment(*trailing)
+        await asyncio.to_thread(self._wav.close)
+        stored = await storage.store_part(self.part_path, "wav")
+
+        results = await asyncio.gather(*self.tasks, return_exceptions=True)
+        failures = [r for r in results if isinstance(r, BaseException)]
+        metrics.observe("live.stop_to_transcript_ms", (time.monotonic() - stopped) * 1000)
+        if failures:
+            # The worker will transcribe the stored recording as a whole, with its own retries
+            metrics.incr("live.segment_failures", len(failures))
+            logger.warning("Live transcription lost %d of %d segments: %s", len(failures), len(results), failures[0])
+            return stored, None
+        return stored, " ".join(text for text in results if text)
+
+    def abort(self) -> None:
+        """Stop transcribing and delete the partial recording"""
+        # Synchronous so it also completes when the connection's task is being cancelled
+        for task in self.tasks:
+            task.cancel()
+        if self._wav is not None:
+            self._wav.close()
+        storage.discard_part(self.part_path)
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session, joinedload
+from .. import metrics
+from ..database import SessionLocal
+from ..models import Attempt
+from .transcription import transcribe_audio, transcript_cache_key
+from .preprocess import prepare_audio
+from .evaluation import evaluate_pm_answer
+from .transcript_cache import get_cached_transcript, store_transcript
+from .leaderboard import record_score, sync_rank
+from .evaluation_cache import evaluation_cache_key, get_cached_evaluation, store_evaluation
+from .resilience import ProviderError
+from . import events
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Times an attempt is put back in the queue after a provider outage before it is marked failed
+ATTEMPT_MAX_RETRIES = int(os.getenv("ATTEMPT_MAX_RETRIES", "5"))
+# First re-queue delay in seconds; doubles per retry up to ATTEMPT_RETRY_DELAY_MAX
+ATTEMPT_RETRY_DELAY = float(os.getenv("ATTEMPT_RETRY_DELAY", "30"))
+ATTEMPT_RETRY_DELAY_MAX = float(os.getenv("ATTEMPT_RETRY_DELAY_MAX", "900"))
+
+
+def _retry_at(retries: int) -> datetime:
+    delay = min(ATTEMPT_RETRY_DELAY * 2 ** (retries - 1), ATTEMPT_RETRY_DELAY_MAX)
+    return datetime.now(timezone.utc) + timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+async def _in_thread(step, *args, **kwargs):
+    """Run a blocking database step in a thread, letting it finish even if the caller is cancelled"""
+    # Otherwise a cancelled worker's cleanup could use the session while the step still holds it
+    task = asyncio.ensure_future(asyncio.to_thread(step, *args, **kwargs))
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        await asyncio.wait([task])
+        raise
+
+
+def _load_attempt(db: Session, attempt_id: int) -> Optional[Attempt]:
+    return db.query(Attempt).options(joinedload(Attempt.question)).filter(Attempt.id == attempt_id).first()
+
+
+def _commit(db: Session, attempt: Attempt, **changes) -> None:
+    for name, value in changes.items():
+        setattr(attempt, name, value)
+    db.commit()
+
+
+def _save_result(db: Session, attempt: Attempt, evaluation: dict) -> bool:
+    """Record the score unless a reclaimed duplicate job already did; True if this call scored it"""
+    score = evaluation.get("overall_score")
+    # Conditional on score IS NULL so a reclaimed duplicate job cannot count twice
+    scored = db.query(Attempt).filter(
+        Attempt.id == attempt.id,
+        Attempt.score.is_(None)
+    ).update({
+        Attempt.score: score,
+        Attempt.feedback: evaluation,
+        Attempt.status: "completed",
+        Attempt.stage: "done",
+        Attempt.error: None
+    }, synchronize_session=False)
+    if scored and score is not None:
+        record_score(db, attempt.user_id, score)
+    db.commit()
+    return bool(scored)
+
+
+def _unscored(db: Session, attempt: Attempt):
+    # Every write after scoring is conditional on this, so a cancelled or reclaimed duplicate job
+    # can never undo a score that has already been recorded
+    return db.query(Attempt).filter(Attempt.id == attempt.id, Attempt.score.is_(None))
+
+
+def _finish_scored(db: Session, attempt: Attempt) -> None:
+    """Claimed a row a previous run already scored: just mark it completed"""
+    db.query(Attempt).filter(Attempt.id == attempt.id).update({
+        Attempt.status: "completed",
+        Attempt.stage: "done",
+        Attempt.error: None
+    }, synchronize_session=False)
+    db.commit()
+    db.refresh(attempt)
+    sync_rank(db, attempt.user_id)  # The previous run may have stopped before it got this far
+
+
+def _hand_back(db: Session, attempt: Attempt) -> bool:
+    """Shutting down: return the job to the queue for the next worker; False if it was already scored"""
+    db.rollback()
+    handed_back = _unscored(db, attempt).update({
+        Attempt.status: "queued",
+        Attempt.claimed_at: None
+    }, synchronize_session=False)
+    db.commit()
+    db.refresh(attempt)  # Reload what the rollback expired here, not on the event loop
+    return bool(handed_back)
+
+
+def _after_provider_error(db: Session, attempt: Attempt, error: ProviderError) -> bool:
+    """Re-queue or fail the attempt; False if it was already scored"""
+    db.rollback()
+    changes = {Attempt.status: "failed", Attempt.error: str(error)}
+    if error.retryable and attempt.retries < ATTEMPT_MAX_RETRIES:
+        # Provider down or overloaded past our retry budget: try the whole job again later
+        retries = attempt.retries + 1
+        changes.update({
+            Attempt.status: "queued",
+            Attempt.retries: retries,
+            Attempt.claimed_at: _retry_at(retries)
+        })
+    updated = _unscored(db, attempt).update(changes, synchronize_session=False)
+    db.commit()
+    db.refresh(attempt)
+    if updated and attempt.status == "queued":
+        logger.warning("Attempt %s re-queued after provider error: %s", attempt.id, error)
+        metrics.incr("attempts.requeued")
+    elif updated:
+        logger.error("Attempt %s failed: %s", attempt.id, error)
+    return bool(updated)
+
+
+def _mark_failed(db: Session, attempt: Attempt, error: Exception) -> bool:
+    """Fail the attempt; False if it was already scored"""
+    db.rollback()
+    failed = _unscored(db, attempt).update({
+        Attempt.status: "failed",
+        Attempt.error: str(error)
+    }, synchronize_session=False)
+    db.commit()
+    db.refresh(attempt)
+    return bool(failed)
+
+
+async def process_attempt(attempt_id: int) -> None:
+    """Transcribe and evaluate a claimed attempt, recording progress on the row"""
+    # Workers share the API's event loop, so every database step runs in a thread. Committed
+    # values stay loaded so reading them afterwards does not query on the loop.
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        attempt = await _in_thread(_load_attempt, db, attempt_id)
+        if attempt is None:
+            return
+        if attempt.score is not None:
+            await _in_thread(_finish_scored, db, attempt)
+            events.publish(attempt_id, "completed", {"score": attempt.score, "feedback": attempt.feedback})
+            return
+
+        try:
+            # Step 1: Transcribe (skipped when resuming a job or the same audio was seen before)
+            if attempt.transcript is None:
+                transcript_key = transcript_cache_key(attempt.audio_hash)
+                cached = await _in_thread(get_cached_transcript, db, transcript_key)
+                if cached is not None:
+                    await _in_thread(_commit, db, attempt, transcript=cached)
+                else:
+                    await _in_thread(_commit, db, attempt, stage="transcribing")
+                    events.publish(attempt_id, "status", {"status": "processing", "stage": "transcribing"})
+                    prepared = await prepare_audio(attempt.audio_url)
+                    try:
+                        transcript = await transcribe_audio(prepared.path)
+                    finally:
+                        prepared.cleanup()
+                    changes = {"transcript": transcript, "audio_bytes": prepared.audio_bytes}
+                    if prepared.audio_seconds is not None:
+                        changes.update(
+                            audio_seconds=prepared.audio_seconds,
+                            processed_bytes=prepared.processed_bytes,
+                            speech_seconds=prepared.speech_seconds
+                        )
+                    await _in_thread(_commit, db, attempt, **changes)
+                    await _in_thread(store_transcript, db, transcript_key, transcript)
+
+            # Step 2: Evaluate with Claude
+            await _in_thread(_commit, db, attempt, stage="evaluating")
+            events.publish(attempt_id, "status", {"status": "processing", "stage": "evaluating"})
+            question = attempt.question
+            cache_key = evaluation_cache_key(question.title, question.description, attempt.transcript)
+            evaluation = await _in_thread(get_cached_evaluation, db, cache_key)
+            if evaluation is None:
+                evaluation = await evaluate_pm_answer(
+                    question.title,
+                    question.description,
+                    attempt.transcript,
+                    on_text=lambda text: events.publish_feedback(attempt_id, text)
+                )
+                await _in_thread(store_evaluation, db, cache_key, evaluation)
+
+            score = evaluation.get("overall_score")
+            scored = await _in_thread(_save_result, db, attempt, evaluation)
+            if scored:
+                events.publish(attempt_id, "completed", {"score": score, "feedback": evaluation})
+            if scored and score is not None:
+                await _in_thread(sync_rank, db, attempt.user_id)
+        except asyncio.CancelledError:
+            if await _in_thread(_hand_back, db, attempt):
+                events.publish(attempt_id, "queued", {"status": "queued", "stage": attempt.stage})
+            raise
+        except ProviderError as e:
+            if not await _in_thread(_after_provider_error, db, attempt, e):
+                return
+            if attempt.status == "failed":
+                events.publish(attempt_id, "failed", {"error": attempt.error})
+            else:
+                events.publish(attempt_id, "queued", {"status": "queued", "stage": attempt.stage, "error": attempt.error})
+        except Exception as e:
+            logger.exception("Processing attempt %s failed", attempt_id)
+            if await _in_thread(_mark_failed, db, attempt, e):
+                events.publish(attempt_id, "failed", {"error": attempt.error})
+    finally:
+        await _in_thread(db.close)
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from dotenv import load_dotenv
+from .. import metrics
+from . import storage
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Shrink uploads with ffmpeg before transcription: mono, 16 kHz, silence trimmed, Opus (0 = send as uploaded)
+AUDIO_PREPROCESS = os.getenv("AUDIO_PREPROCESS", "1") == "1"
+FFMPEG_PATH = os.getenv("FFMPEG_PATH", "ffmpeg")
+# Opus bitrate for the transcription copy; 24k is plenty for 16 kHz speech
+PREPROCESS_BITRATE = os.getenv("PREPROCESS_BITRATE", "24k")
+# Audio below this level counts as silence; leading/trailing silence is dropped and longer pauses
+# are shortened to PREPROCESS_MAX_PAUSE seconds
+PREPROCESS_SILENCE_DB = float(os.getenv("PREPROCESS_SILENCE_DB", "-45"))
+PREPROCESS_MAX_PAUSE = float(os.getenv("PREPROCESS_MAX_PAUSE", "1.0"))
+# Give up on (and transcribe the original of) a file ffmpeg takes longer than this to process
+PREPROCESS_TIMEOUT = float(os.getenv("PREPROCESS_TIMEOUT", "120"))
+
+SAMPLE_RATE = 16000
+_BYTES_PER_SECOND = SAMPLE_RATE * 2  # Mono 16-bit PCM
+_CHUNK_BYTES = 64 * 1024
+
+_warned_missing = False
+
+
+class PreprocessError(Exception):
+    """ffmpeg could not decode or encode the audio"""
+
+
+@dataclass
+class PreparedAudio:
+    path: str  # File to transcribe: the compact copy, or the original if preprocessing was skipped
+    audio_bytes: int
+    processed_bytes: Optional[int] = None
+    audio_seconds: Optional[float] = None  # Decoded length of the upload
+    speech_seconds: Optional[float] = None  # Length after silence trimming
+    temporary: bool = False
+
+    def cleanup(self) -> None:
+        """Delete the compact copy once it has been transcribed"""
+        if self.temporary:
+            storage.discard_part(self.path)
+
+
+def _silence_filter() -> str:
+    threshold = f"{PREPROCESS_SILENCE_DB}dB"
+    return (
+        f"silenceremove=start_periods=1:start_threshold={threshold}:start_silence=0.1"
+        f":stop_periods=-1:stop_threshold={threshold}"
+        f":stop_duration={PREPROCESS_MAX_PAUSE}:stop_silence={PREPROCESS_MAX_PAUSE}"
+    )
+
+
+async def _start(args: List[str], stdin: bool = False) -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_exec(
+        FFMPEG_PATH, "-hide_banner", "-loglevel", "error", *args,
+        stdin=asyncio.subprocess.PIPE if stdin else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+
+async def _pump(source: asyncio.StreamReader, sink: asyncio.StreamWriter) -> int:
+    """Copy PCM from the decoder to the encoder a chunk at a time; returns the bytes copied"""
+    copied = 0
+    try:
+        while chunk := await source.read(_CHUNK_BYTES):
+            copied += len(chunk)
+            sink.write(chunk)
+            await sink.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        pass  # The encoder exited early; its exit status says why
+    finally:
+        sink.close()
+    return copied
+
+
+async def _transcode(path: str, part_path: str) -> Tuple[int, bytes]:
+    """Decode the upload to PCM and stream it into the Opus encoder; returns (PCM bytes, encoder progress)"""
+    # Decode and downmix first so the length of the original is known exactly. -t caps the
+    # decoded length: the upload limit is a byte budget, and low-bitrate audio decodes to far more
+    decode = await _start([
+        "-i", path, "-vn", "-t", str(storage.MAX_AUDIO_SECONDS),
+        "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "pipe:1"
+    ])
+    encode = None
+    try:
+        encode = await _start([
+            "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "-i", "pipe:0",
+            "-af", _silence_filter(),
+            "-c:a", "libopus", "-b:a", PREPROCESS_BITRATE, "-application", "voip",
+            "-f", "ogg", "-progress", "pipe:1", "-nostats", "-y", part_path
+        ], stdin=True)
+        pcm_bytes, decode_errors, progress, encode_errors, _, _ = await asyncio.wait_for(asyncio.gather(
+            _pump(decode.stdout, encode.stdin),
+            decode.stderr.read(),
+            encode.stdout.read(),
+            encode.stderr.read(),
+            decode.wait(),
+            encode.wait()
+        ), timeout=PREPROCESS_TIMEOUT)
+    except BaseException:
+        for process in (decode, encode):
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+        raise
+    for process, stderr in ((decode, decode_errors), (encode, encode_errors)):
+        if process.returncode != 0:
+            raise PreprocessError(stderr.decode(errors="replace").strip()[-500:] or f"exit {process.returncode}")
+    return pcm_bytes, progress
+
+
+def _progress_seconds(progress: bytes) -> Optional[float]:
+    """Last out_time_us reported by `-progress`, in seconds"""
+    seconds = None
+    for line in progress.decode(errors="replace").splitlines():
+        key, _, value = line.partition("=")
+        if key == "out_time_us" and value.strip().lstrip("-").isdigit():
+            seconds = max(int(value), 0) / 1e6
+    return seconds
+
+
+async def prepare_audio(path: str) -> PreparedAudio:
+    """Compact copy of an upload for transcription; falls back to the original file on any problem"""
+    original = PreparedAudio(path=path, audio_bytes=os.path.getsize(path))
+    if not AUDIO_PREPROCESS:
+        return original
+    if shutil.which(FFMPEG_PATH) is None:
+        global _warned_missing
+        metrics.incr("preprocess.skipped")
+        if not _warned_missing:
+            logger.warning("AUDIO_PREPROCESS is on but %s was not found; transcribing uploads as-is", FFMPEG_PATH)
+            _warned_missing = True
+        return original
+
+    # The extension tells the transcriber the format
+    part_path = f"{storage.new_part_path()}.ogg"
+    try:
+        pcm_bytes, progress = await _transcode(path, part_path)
+    except (PreprocessError, asyncio.TimeoutError, OSError) as e:
+        storage.discard_part(part_path)
+        metrics.incr("preprocess.failures")
+        logger.warning("Preprocessing %s failed, transcribing it as uploaded: %s", path, e)
+        return original
+
+    original.audio_seconds = pcm_bytes / _BYTES_PER_SECOND
+    if original.audio_seconds >= storage.MAX_AUDIO_SECONDS:
+        # Only the first MAX_AUDIO_SECONDS are transcribed
+        metrics.incr("preprocess.truncated")
+        logger.warning("%s is longer than MAX_AUDIO_SECONDS; transcribing the first %ss", path, storage.MAX_AUDIO_SECONDS)
+    speech_seconds = _progress_seconds(progress)
+    if not speech_seconds:
+        # Nothing above the silence threshold; let the transcriber judge the original
+        storage.discard_part(part_path)
+        metrics.incr("preprocess.all_silence")
+        original.speech_seconds = 0.0
+        return original
+
+    prepared = PreparedAudio(
+        path=part_path,
+        audio_bytes=original.audio_bytes,
+        processed_bytes=os.path.getsize(part_path),
+        audio_seconds=original.audio_seconds,
+        speech_seconds=speech_seconds,
+        temporary=True
+    )
+    metrics.incr("preprocess.bytes_saved", prepared.audio_bytes - prepared.processed_bytes)
+    metrics.incr("preprocess.seconds_saved", prepared.audio_seconds - prepared.speech_seconds)
+    return prepared
@@ -0,0 +1,84 @@
+import asyncio
+import os
+from typing import Optional
+import httpx
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Maximum in-flight requests per provider for this process
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+ANTHROPIC_MAX_CONCURRENCY = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "16"))
+
+_openai_client: Optional[AsyncOpenAI] = None
+_anthropic_client: Optional[AsyncAnthropic] = None
+_openai_semaphore: Optional[asyncio.Semaphore] = None
+_anthropic_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _http_client(max_connections: int) -> httpx.AsyncClient:
+    """One pooled HTTP client per provider so connections are reused across calls"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        ),
+        timeout=httpx.Timeout(600.0, connect=10.0)
+    )
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Shared async OpenAI client"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            max_retries=0,  # Retries, timeouts and backoff are handled by resilience.call_provider
+            http_client=_http_client(OPENAI_MAX_CONCURRENCY)
+        )
+    return _openai_client
+
+
+def get_anthropic_client() -> AsyncAnthropic:
+    """Shared async Anthropic client"""
+    global _anthropic_client
+    if _anthropic_client is None:
+        _anthropic_client = AsyncAnthropic(
+            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            base_url=os.getenv("ANTHROPIC_BASE_URL") or None,
+            max_retries=0,  # Retries, timeouts and backoff are handled by resilience.call_provider
+            http_client=_http_client(ANTHROPIC_MAX_CONCURRENCY)
+        )
+    return _anthropic_client
+
+
+def openai_slot() -> asyncio.Semaphore:
+    """Semaphore bounding concurrent OpenAI calls"""
+    global _openai_semaphore
+    if _openai_semaphore is None:
+        _openai_semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    return _openai_semaphore
+
+
+def anthropic_slot() -> asyncio.Semaphore:
+    """Semaphore bounding concurrent Anthropic calls"""
+    global _anthropic_semaphore
+    if _anthropic_semaphore is None:
+        _anthropic_semaphore = asyncio.Semaphore(ANTHROPIC_MAX_CONCURRENCY)
+    return _anthropic_semaphore
+
+
+async def close_clients() -> None:
+    """Close the pooled provider connections (called on shutdown)"""
+    global _openai_client, _anthropic_client, _openai_semaphore, _anthropic_semaphore
+    if _openai_client is not None:
+        await _openai_client.close()
+    if _anthropic_client is not None:
+        await _anthropic_client.close()
+    _openai_client = None
+    _anthropic_client = None
+    _openai_semaphore = None
+    _anthropic_semaphore = None
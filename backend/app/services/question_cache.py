@@ -0,0 +1,92 @@
+import os
+import time
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+from .. import metrics
+from ..cache import LRUCache
+from ..models import Question
+from ..pagination import keyset_page_async
+from .versions import QUESTIONS, get_version_async
+
+load_dotenv()
+
+QUESTION_CACHE_SIZE = int(os.getenv("QUESTION_CACHE_SIZE", "2048"))
+QUESTION_PAGE_CACHE_SIZE = int(os.getenv("QUESTION_PAGE_CACHE_SIZE", "256"))
+QUESTION_CACHE_TTL = float(os.getenv("QUESTION_CACHE_TTL", "300"))
+# How often to check the questions version row for writes made by other processes
+QUESTION_CACHE_POLL_SECONDS = float(os.getenv("QUESTION_CACHE_POLL_SECONDS", "1"))
+
+_questions = LRUCache(maxsize=QUESTION_CACHE_SIZE, ttl=QUESTION_CACHE_TTL)
+_pages = LRUCache(maxsize=QUESTION_PAGE_CACHE_SIZE, ttl=QUESTION_CACHE_TTL)
+_seen_version: Optional[int] = None
+_polled_at = 0.0
+
+
+def _snapshot(question: Question) -> dict:
+    return {
+        "id": question.id,
+        "creator_id": question.creator_id,
+        "title": question.title,
+        "description": question.description,
+        "category": question.category,
+        "created_at": question.created_at,
+    }
+
+
+def invalidate(question_id: Optional[int] = None) -> None:
+    """Drop cached listing pages, and the given question, after a local write"""
+    if question_id is not None:
+        _questions.pop(question_id)
+    _pages.clear()
+
+
+async def _sync_version(db: AsyncSession) -> None:
+    """Flush everything once another process has bumped the questions version"""
+    global _seen_version, _polled_at
+    if time.monotonic() - _polled_at < QUESTION_CACHE_POLL_SECONDS:
+        return
+    _polled_at = time.monotonic()
+    version = await get_version_async(db, QUESTIONS)
+    if version != _seen_version:
+        if _seen_version is not None:
+            metrics.incr("question_cache.flushes")
+        _questions.clear()
+        _pages.clear()
+        _seen_version = version
+
+
+async def get_question(db: AsyncSession, question_id: int) -> Optional[dict]:
+    """Snapshot of a question, read through the cache; None if it does not exist"""
+    await _sync_version(db)
+    snapshot = _questions.get(question_id)
+    if snapshot is not None:
+        metrics.incr("question_cache.hits")
+        return snapshot
+    metrics.incr("question_cache.misses")
+    question = await db.scalar(select(Question).where(Question.id == question_id))
+    if question is None:
+        return None
+    snapshot = _snapshot(question)
+    _questions.set(question_id, snapshot)
+    return snapshot
+
+
+async def get_page(db: AsyncSession, category: Optional[str], cursor: Optional[str],
+                   limit: int) -> Tuple[List[dict], Optional[str]]:
+    """One keyset page of question snapshots; raises ValueError for a bad cursor"""
+    await _sync_version(db)
+    key = (category, cursor, limit)
+    page = _pages.get(key)
+    if page is not None:
+        metrics.incr("question_cache.page_hits")
+        return page
+    metrics.incr("question_cache.page_misses")
+    query = select(Question)
+    if category:
+        query = query.where(Question.category == category)
+    questions, next_cursor = await keyset_page_async(db, query, Question, cursor, limit)
+    page = ([_snapshot(question) for question in questions], next_cursor)
+    _pages.set(key, page)
+    return page
@@ -0,0 +1,93 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from dotenv import load_dotenv
+from ..models import UserStats
+
+load_dotenv()
+
+# Reload from user_stats this often to pick up scores written by other processes
+RANK_INDEX_REFRESH_SECONDS = float(os.getenv("RANK_INDEX_REFRESH_SECONDS", "60"))
+
+
+class RankIndex:
+    """Sorted array of (-avg_score, user_id) keys; rank lookups and windows use bisect"""
+
+    def __init__(self):
+        self._keys: List[Tuple[float, int]] = []
+        self._stats: Dict[int, Tuple[float, int]] = {}  # user_id -> (avg_score, scored_attempts)
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._reloading = False
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Load (or periodically reload) the index from user_stats"""
+        loaded_at = self._loaded_at
+        if loaded_at is not None and (
+            self._reloading or time.monotonic() - loaded_at < RANK_INDEX_REFRESH_SECONDS
+        ):
+            return  # Fresh, or another request is already refreshing it; serve what we have
+        self._reloading = True
+        try:
+            rows = (await db.execute(
+                select(UserStats.user_id, UserStats.avg_score, UserStats.scored_attempts)
+                .where(UserStats.avg_score.isnot(None))
+            )).all()
+        finally:
+            self._reloading = False
+        keys = sorted((-row.avg_score, row.user_id) for row in rows)
+        stats = {row.user_id: (row.avg_score, row.scored_attempts) for row in rows}
+        with self._lock:
+            self._keys = keys
+            self._stats = stats
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Force a reload from user_stats on next use"""
+        with self._lock:
+            self._loaded_at = None
+
+    def update(self, user_id: int, avg_score: Optional[float], scored_attempts: int) -> None:
+        """Move a user to their new position after a score write"""
+        with self._lock:
+            if self._loaded_at is None:
+                return  # Not loaded yet; the first load will read the new value
+            previous = self._stats.pop(user_id, None)
+            if previous is not None:
+                index = bisect.bisect_left(self._keys, (-previous[0], user_id))
+                del self._keys[index]
+            if avg_score is not None:
+                bisect.insort(self._keys, (-avg_score, user_id))
+                self._stats[user_id] = (avg_score, scored_attempts)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based position of a user, or None if they have no scored attempts"""
+        with self._lock:
+            stats = self._stats.get(user_id)
+            if stats is None:
+                return None
+            return bisect.bisect_left(self._keys, (-stats[0], user_id)) + 1
+
+    def position_after(self, avg_score: float, user_id: int) -> int:
+        """0-based index of the first entry ranked below the given key"""
+        with self._lock:
+            return bisect.bisect_right(self._keys, (-avg_score, user_id))
+
+    def window(self, start: int, size: int) -> List[Tuple[int, int, float, int]]:
+        """(rank, user_id, avg_score, scored_attempts) for positions [start, start + size)"""
+        with self._lock:
+            keys = self._keys[max(start, 0):max(start, 0) + size]
+            return [
+                (max(start, 0) + offset + 1, user_id, -neg_score, self._stats[user_id][1])
+                for offset, (neg_score, user_id) in enumerate(keys)
+            ]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+rank_index = RankIndex()
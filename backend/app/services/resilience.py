@@ -0,0 +1,190 @@
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+import anthropic
+import httpx
+import openai
+from dotenv import load_dotenv
+from .. import metrics
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Attempts per provider call (first try included) and the backoff between them
+PROVIDER_MAX_ATTEMPTS = int(os.getenv("PROVIDER_MAX_ATTEMPTS", "4"))
+PROVIDER_BACKOFF_BASE = float(os.getenv("PROVIDER_BACKOFF_BASE", "0.5"))
+PROVIDER_BACKOFF_MAX = float(os.getenv("PROVIDER_BACKOFF_MAX", "20"))
+# Consecutive failures that open a provider's circuit, and how long it stays open
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+_RETRYABLE_STATUS = {408, 409, 429}
+
+
+class ProviderError(Exception):
+    """A provider call that failed after the resilience policy gave up"""
+
+    def __init__(self, provider: str, message: str, retryable: bool):
+        super().__init__(f"{provider}: {message}")
+        self.provider = provider
+        self.retryable = retryable  # True if trying again later may succeed
+
+
+class ProviderUnavailable(ProviderError):
+    """Raised without calling the provider while its circuit is open"""
+
+    def __init__(self, provider: str):
+        super().__init__(provider, "circuit open, failing fast", retryable=True)
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures; once the reset window passes, lets one trial call through"""
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    def before_call(self) -> None:
+        if self.opened_at is None:
+            return
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            metrics.incr(f"provider.{self.name}.short_circuited")
+            raise ProviderUnavailable(self.name)
+        # Half-open: this call is the trial; re-arming the window makes concurrent callers fail fast
+        self.opened_at = now
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("Circuit for %s closed", self.name)
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("Circuit for %s opened after %d failures", self.name, self.failures)
+                metrics.incr(f"provider.{self.name}.circuit_opened")
+            self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Process-wide circuit breaker for a provider"""
+    if provider not in _breakers:
+        _breakers[provider] = CircuitBreaker(provider)
+    return _breakers[provider]
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Timeouts, connection errors, 408/409/429 and 5xx are worth another try; other errors are not"""
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError,
+                        openai.APIConnectionError, anthropic.APIConnectionError)):
+        return True
+    if isinstance(exc, (openai.APIStatusError, anthropic.APIStatusError)):
+        return exc.status_code in _RETRYABLE_STATUS or exc.status_code >= 500
+    return False
+
+
+def _retry_after(exc: BaseException) -> float:
+    """Seconds the provider asked us to wait (Retry-After on 429/503), or 0"""
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return max(float(value), 0.0) if value else 0.0
+    except ValueError:
+        return 0.0
+
+
+def backoff_delay(attempt: int, base: float = PROVIDER_BACKOFF_BASE, cap: float = PROVIDER_BACKOFF_MAX) -> float:
+    """Full-jitter exponential backoff before retry number `attempt` (1-based)"""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+async def _hedged(provider: str, call: Callable[[], Awaitable[T]], hedge_after: Optional[float]) -> T:
+    """Run `call`; if it is still pending after `hedge_after` seconds, race a second copy (same slot)"""
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        if hedge_after is None:
+            return await tasks[0]
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            metrics.incr(f"provider.{provider}.hedges")
+            tasks.append(asyncio.ensure_future(call()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is not tasks[0]:
+                        metrics.incr(f"provider.{provider}.hedge_wins")
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def call_provider(
+    provider: str,
+    call: Callable[[], Awaitable[T]],
+    *,
+    slot: Optional[asyncio.Semaphore] = None,
+    timeout: float,
+    deadline: float,
+    hedge_after: Optional[float] = None,
+    max_attempts: int = PROVIDER_MAX_ATTEMPTS,
+) -> T:
+    """Call a provider under per-attempt timeouts, an overall deadline, retries and its circuit breaker"""
+    breaker = get_breaker(provider)
+    loop = asyncio.get_running_loop()
+    give_up_at: Optional[float] = None
+    attempt = 0
+
+    while True:
+        attempt += 1
+        breaker.before_call()
+        # Waiting for a concurrency slot is local queueing, so it counts against neither
+        # the timeout nor the breaker; the deadline starts once the first request goes out
+        async with slot or contextlib.nullcontext():
+            if give_up_at is None:
+                give_up_at = loop.time() + deadline
+            budget = min(timeout, give_up_at - loop.time())
+            try:
+                result = await asyncio.wait_for(_hedged(provider, call, hedge_after), timeout=budget)
+            except asyncio.TimeoutError as e:
+                metrics.incr(f"provider.{provider}.timeouts")
+                error, message = e, f"no response within {budget:.1f}s"
+            except Exception as e:
+                if not is_retryable(e):
+                    breaker.record_success()  # The provider answered; the request itself was bad
+                    raise ProviderError(provider, str(e), retryable=False) from e
+                metrics.incr(f"provider.{provider}.errors")
+                error, message = e, str(e)
+            else:
+                breaker.record_success()
+                return result
+
+        breaker.record_failure()
+        delay = max(backoff_delay(attempt), _retry_after(error))
+        if attempt >= max_attempts or loop.time() + delay >= give_up_at:
+            raise ProviderError(provider, message, retryable=True) from error
+        metrics.incr(f"provider.{provider}.retries")
+        logger.warning("%s call failed (%s), retry %d in %.1fs", provider, message, attempt, delay)
+        await asyncio.sleep(delay)
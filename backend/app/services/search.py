@@ -0,0 +1,114 @@
+import html
+import re
+from typing import List
+from sqlalchemy import Float, Integer, String, and_, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import Question
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+# The database brackets matches with these private-use characters; the snippet is HTML-escaped
+# before they become <mark> tags, so markup in user-written questions is never passed through
+_MATCH_START = "\ue000"
+_MATCH_END = "\ue001"
+
+_SQLITE_SEARCH = text(f"""
+    SELECT rowid AS id,
+           -bm25(questions_fts, 10.0, 1.0) AS rank,
+           snippet(questions_fts, -1, '{_MATCH_START}', '{_MATCH_END}', '…', 16) AS snippet
+    FROM questions_fts
+    WHERE questions_fts MATCH :query
+    ORDER BY rank DESC
+    LIMIT :limit
+""").columns(id=Integer, rank=Float, snippet=String)
+
+_POSTGRES_SEARCH = text(f"""
+    SELECT questions.id,
+           ts_rank_cd(questions.search_vector, query) AS rank,
+           ts_headline('english', questions.title || '. ' || questions.description, query,
+                       'StartSel={_MATCH_START}, StopSel={_MATCH_END}, MaxWords=30, MinWords=10') AS snippet
+    FROM questions, websearch_to_tsquery('english', :query) AS query
+    WHERE questions.search_vector @@ query
+    ORDER BY rank DESC
+    LIMIT :limit
+""").columns(id=Integer, rank=Float, snippet=String)
+
+
+# Length of the plain description excerpt returned as the snippet by the fallback search
+FALLBACK_SNIPPET_CHARS = 200
+
+
+def _fts5_query(query: str) -> str:
+    """Turn free text into an FTS5 expression matching every word as a prefix"""
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _highlight(snippet: str) -> str:
+    """HTML snippet: the text escaped, then the database's match brackets turned into <mark> tags"""
+    return html.escape(snippet).replace(_MATCH_START, SNIPPET_START).replace(_MATCH_END, SNIPPET_END)
+
+
+def _like_pattern(word: str) -> str:
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _result(question: Question, rank: float, snippet: str) -> dict:
+    return {
+        "id": question.id,
+        "creator_id": question.creator_id,
+        "title": question.title,
+        "description": question.description,
+        "category": question.category,
+        "created_at": question.created_at,
+        "rank": rank,
+        "snippet": snippet,
+    }
+
+
+async def _ilike_search(db: AsyncSession, query: str, limit: int) -> List[dict]:
+    """Unindexed fallback for databases without a full-text index: every word in the title or description"""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return []
+    conditions = [
+        or_(Question.title.ilike(pattern, escape="\\"), Question.description.ilike(pattern, escape="\\"))
+        for pattern in map(_like_pattern, words)
+    ]
+    questions = (await db.scalars(
+        select(Question).where(and_(*conditions)).order_by(Question.created_at.desc(), Question.id.desc()).limit(limit)
+    )).all()
+    results = [
+        # Rank by how many of the words are in the title; newest first among equals
+        _result(question, float(sum(word.lower() in question.title.lower() for word in words)),
+                html.escape(question.description[:FALLBACK_SNIPPET_CHARS]))
+        for question in questions
+    ]
+    return sorted(results, key=lambda result: result["rank"], reverse=True)
+
+
+async def search_questions(db: AsyncSession, query: str, limit: int) -> List[dict]:
+    """Ranked full-text matches as dicts of question fields plus `rank` and `snippet`"""
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        match = _fts5_query(query)
+        if not match:
+            return []
+        hits = (await db.execute(_SQLITE_SEARCH, {"query": match, "limit": limit})).all()
+    elif dialect == "postgresql":
+        hits = (await db.execute(_POSTGRES_SEARCH, {"query": query, "limit": limit})).all()
+    else:
+        return await _ilike_search(db, query, limit)
+
+    if not hits:
+        return []
+    questions = {
+        question.id: question
+        for question in await db.scalars(select(Question).where(Question.id.in_([hit.id for hit in hits])))
+    }
+    return [
+        _result(question, hit.rank, _highlight(hit.snippet))
+        for hit in hits
+        if (question := questions.get(hit.id)) is not None
+    ]
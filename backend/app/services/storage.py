@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from fastapi import UploadFile
+from dotenv import load_dotenv
+
+load_dotenv()
+
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads/audio")
+# Bytes read from the request and written to disk per step
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+# Whisper rejects files over 25 MB, so there is no point accepting more
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+# Longest answer accepted; enforced as a byte budget at MAX_AUDIO_BITRATE, and preprocessing stops decoding here
+MAX_AUDIO_SECONDS = int(os.getenv("MAX_AUDIO_SECONDS", "600"))
+MAX_AUDIO_BITRATE = int(os.getenv("MAX_AUDIO_BITRATE", "256000"))  # bits per second
+
+os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds the configured size or duration budget"""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds {limit} bytes")
+        self.limit = limit
+
+
+@dataclass
+class StoredUpload:
+    path: str
+    sha256: str
+    size: int
+    deduplicated: bool = False
+
+
+def max_upload_bytes() -> int:
+    """Largest accepted audio payload, taking the duration limit into account"""
+    return min(MAX_UPLOAD_BYTES, MAX_AUDIO_SECONDS * MAX_AUDIO_BITRATE // 8)
+
+
+def content_path(sha256: str, extension: str) -> str:
+    """Location of a stored file, sharded by the first two hex digits of its hash"""
+    return os.path.join(UPLOAD_DIR, sha256[:2], f"{sha256}.{extension}")
+
+
+def _commit_part(part_path: str, file_path: str) -> bool:
+    """Move a finished upload into place; returns False if identical bytes were already stored"""
+    if os.path.exists(file_path):
+        _remove_quietly(part_path)
+        return False
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    os.replace(part_path, file_path)
+    return True
+
+
+def new_part_path() -> str:
+    """Temporary path for an upload being written; pass it to store_part once complete"""
+    return os.path.join(UPLOAD_DIR, f".{uuid.uuid4()}.part")
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_upload(upload: UploadFile, extension: str) -> StoredUpload:
+    """Stream an upload to the content-addressed store in fixed-size chunks, hashing it in the same pass"""
+    extension = "".join(c for c in extension if c.isalnum())[:10] or "webm"
+    limit = max_upload_bytes()
+    digest = hashlib.sha256()
+    size = 0
+    part_path = new_part_path()
+
+    f = await asyncio.to_thread(open, part_path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > limit:
+                raise UploadTooLarge(limit)
+            digest.update(chunk)
+            await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(_remove_quietly, part_path)
+        raise
+    await asyncio.to_thread(f.close)
+
+    sha256 = digest.hexdigest()
+    file_path = content_path(sha256, extension)
+    stored_new = await asyncio.to_thread(_commit_part, part_path, file_path)
+    return StoredUpload(path=file_path, sha256=sha256, size=size, deduplicated=not stored_new)
+
+
+def _hash_file(path: str):
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            digest.update(chunk)
+    return digest.hexdigest(), size
+
+
+async def store_part(part_path: str, extension: str) -> StoredUpload:
+    """Move a part file written in place (e.g. a WAV built while streaming) into the content-addressed store"""
+    sha256, size = await asyncio.to_thread(_hash_file, part_path)
+    file_path = content_path(sha256, extension)
+    stored_new = await asyncio.to_thread(_commit_part, part_path, file_path)
+    return StoredUpload(path=file_path, sha256=sha256, size=size, deduplicated=not stored_new)
+
+
+def discard_part(part_path: str) -> None:
+    """Delete an abandoned part file"""
+    _remove_quietly(part_path)
@@ -0,0 +1,30 @@
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .. import metrics
+from ..models import TranscriptCache
+
+
+def get_cached_transcript(db: Session, audio_hash: Optional[str]) -> Optional[str]:
+    """Return a previously computed transcript for identical audio, if any"""
+    if not audio_hash:
+        return None
+    entry = db.query(TranscriptCache.transcript).filter(
+        TranscriptCache.audio_hash == audio_hash
+    ).first()
+    if entry is None:
+        metrics.incr("transcript_cache.misses")
+        return None
+    metrics.incr("transcript_cache.hits")
+    return entry.transcript
+
+
+def store_transcript(db: Session, audio_hash: Optional[str], transcript: str) -> None:
+    """Remember a transcript for this audio; a concurrent insert of the same hash is fine"""
+    if not audio_hash:
+        return
+    db.add(TranscriptCache(audio_hash=audio_hash, transcript=transcript))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
@@ -1,20 +1,220 @@
+import asyncio
+import hashlib
+import io
+import logging
 import os
-from openai import OpenAI
+import random
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Type
 from dotenv import load_dotenv
+from .. import metrics
+from .providers import get_openai_client, openai_slot
+from .resilience import call_provider
 
 load_dotenv()
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+logger = logging.getLogger(__name__)
 
+# Which engine turns answers into text: openai (Whisper API), local (faster-whisper on CPU) or fake
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "openai")
+# Concurrent transcriptions for the local and fake backends (the API uses OPENAI_MAX_CONCURRENCY)
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "2"))
 
-async def transcribe_audio(audio_file_path: str) -> str:
-    """Transcribe audio file using OpenAI Whisper API"""
-    try:
-        with open(audio_file_path, "rb") as audio_file:
-            transcript = client.audio.transcriptions.create(
+# Per-attempt timeout and overall deadline (seconds) for one transcription, retries included
+TRANSCRIPTION_TIMEOUT = float(os.getenv("TRANSCRIPTION_TIMEOUT", "120"))
+TRANSCRIPTION_DEADLINE = float(os.getenv("TRANSCRIPTION_DEADLINE", "300"))
+# Send a duplicate request if the first has not answered after this many seconds (0 = off)
+TRANSCRIPTION_HEDGE_AFTER = float(os.getenv("TRANSCRIPTION_HEDGE_AFTER", "0")) or None
+
+# Local backend: model size or path, CTranslate2 quantization, and threads per worker (0 = automatic)
+LOCAL_WHISPER_MODEL = os.getenv("LOCAL_WHISPER_MODEL", "small")
+LOCAL_WHISPER_COMPUTE_TYPE = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+LOCAL_WHISPER_CPU_THREADS = int(os.getenv("LOCAL_WHISPER_CPU_THREADS", "0"))
+# Beam width (1 = greedy, fastest) and where downloaded models are kept
+LOCAL_WHISPER_BEAM_SIZE = int(os.getenv("LOCAL_WHISPER_BEAM_SIZE", "1"))
+LOCAL_WHISPER_MODEL_DIR = os.getenv("LOCAL_WHISPER_MODEL_DIR") or None
+
+# Fake backend: simulated processing time per transcription, in seconds
+FAKE_TRANSCRIPTION_LATENCY = float(os.getenv("FAKE_TRANSCRIPTION_LATENCY", "0"))
+
+
+class Transcriber(ABC):
+    """A speech-to-text engine; one instance per process, set up by start_transcriber"""
+
+    name = "base"
+
+    @property
+    def cache_tag(self) -> str:
+        """Identifies the engine and its settings in transcript cache keys"""
+        return self.name
+
+    async def start(self) -> None:
+        """Load anything expensive before the first request"""
+
+    @abstractmethod
+    async def transcribe(self, audio_bytes: bytes, filename: str) -> str:
+        """Text of the audio; the filename's extension tells the engine the format"""
+
+    async def close(self) -> None:
+        """Release resources at shutdown"""
+
+
+class OpenAITranscriber(Transcriber):
+    """Whisper through the OpenAI API, under the provider resilience policy"""
+
+    name = "openai"
+
+    async def transcribe(self, audio_bytes: bytes, filename: str) -> str:
+        async def request():
+            return await get_openai_client().audio.transcriptions.create(
                 model="whisper-1",
-                file=audio_file
+                file=(filename, audio_bytes)
             )
+
+        transcript = await call_provider(
+            "openai",
+            request,
+            slot=openai_slot(),
+            timeout=TRANSCRIPTION_TIMEOUT,
+            deadline=TRANSCRIPTION_DEADLINE,
+            hedge_after=TRANSCRIPTION_HEDGE_AFTER
+        )
         return transcript.text
-    except Exception as e:
-        raise Exception(f"Transcription failed: {str(e)}")
+
+
+class LocalWhisperTranscriber(Transcriber):
+    """faster-whisper (CTranslate2) on the CPU with a quantized model kept in memory"""
+
+    name = "local"
+
+    def __init__(self):
+        self.model = None
+        self.executor = ThreadPoolExecutor(max_workers=TRANSCRIPTION_WORKERS, thread_name_prefix="whisper")
+
+    @property
+    def cache_tag(self) -> str:
+        return f"local:{LOCAL_WHISPER_MODEL}:{LOCAL_WHISPER_COMPUTE_TYPE}:{LOCAL_WHISPER_BEAM_SIZE}"
+
+    def _load(self):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise RuntimeError("TRANSCRIPTION_BACKEND=local needs `pip install faster-whisper`") from e
+        started = time.monotonic()
+        model = WhisperModel(
+            LOCAL_WHISPER_MODEL,
+            device="cpu",
+            compute_type=LOCAL_WHISPER_COMPUTE_TYPE,
+            cpu_threads=LOCAL_WHISPER_CPU_THREADS,
+            # One CTranslate2 replica per worker thread so transcriptions run in parallel
+            num_workers=TRANSCRIPTION_WORKERS,
+            download_root=LOCAL_WHISPER_MODEL_DIR
+        )
+        logger.info("Loaded Whisper %s (%s) in %.1fs", LOCAL_WHISPER_MODEL, LOCAL_WHISPER_COMPUTE_TYPE,
+                    time.monotonic() - started)
+        return model
+
+    async def start(self) -> None:
+        if self.model is None:
+            self.model = await asyncio.get_running_loop().run_in_executor(self.executor, self._load)
+
+    def _transcribe(self, audio_bytes: bytes) -> str:
+        segments, _ = self.model.transcribe(
+            io.BytesIO(audio_bytes),
+            beam_size=LOCAL_WHISPER_BEAM_SIZE,
+            vad_filter=True  # Skip silence instead of decoding it
+        )
+        # Segments are decoded lazily, so they must be consumed on the worker thread
+        return " ".join(segment.text.strip() for segment in segments)
+
+    async def transcribe(self, audio_bytes: bytes, filename: str) -> str:
+        await self.start()
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._transcribe, audio_bytes)
+
+    async def close(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.model = None
+
+
+class FakeTranscriber(Transcriber):
+    """Deterministic text derived from the audio bytes, for tests, benchmarks and offline load runs"""
+
+    name = "fake"
+    WORDS = ("users", "metrics", "retention", "trade-off", "roadmap", "segment", "pricing", "launch",
+             "experiment", "funnel", "onboarding", "growth", "churn", "priority", "feedback", "impact")
+    BYTES_PER_WORD = 12000  # About 2.5 words per second of 16 kHz PCM
+
+    def __init__(self):
+        self.slot = asyncio.Semaphore(TRANSCRIPTION_WORKERS)
+
+    async def transcribe(self, audio_bytes: bytes, filename: str) -> str:
+        async with self.slot:
+            if FAKE_TRANSCRIPTION_LATENCY:
+                await asyncio.sleep(FAKE_TRANSCRIPTION_LATENCY)
+        # Seeded by the content, so identical audio always gets the identical transcript
+        rng = random.Random(hashlib.sha256(audio_bytes).digest())
+        count = max(3, len(audio_bytes) // self.BYTES_PER_WORD)
+        return " ".join(rng.choice(self.WORDS) for _ in range(count)) + "."
+
+
+BACKENDS: Dict[str, Type[Transcriber]] = {
+    "openai": OpenAITranscriber,
+    "local": LocalWhisperTranscriber,
+    "fake": FakeTranscriber,
+}
+
+_transcriber: Optional[Transcriber] = None
+
+
+def get_transcriber() -> Transcriber:
+    """The configured backend, created on first use"""
+    global _transcriber
+    if _transcriber is None:
+        if TRANSCRIPTION_BACKEND not in BACKENDS:
+            raise RuntimeError(f"Unknown TRANSCRIPTION_BACKEND {TRANSCRIPTION_BACKEND!r}; "
+                               f"expected one of {', '.join(BACKENDS)}")
+        _transcriber = BACKENDS[TRANSCRIPTION_BACKEND]()
+    return _transcriber
+
+
+async def start_transcriber() -> None:
+    """Create the backend and preload its model (called on startup)"""
+    await get_transcriber().start()
+
+
+async def close_transcriber() -> None:
+    """Release the backend (called on shutdown)"""
+    global _transcriber
+    if _transcriber is not None:
+        await _transcriber.close()
+    _transcriber = None
+
+
+def transcript_cache_key(audio_hash: Optional[str]) -> Optional[str]:
+    """Transcript cache key for this audio under the current backend (the bare hash for the API, as before)"""
+    if not audio_hash:
+        return None
+    tag = get_transcriber().cache_tag
+    return audio_hash if tag == OpenAITranscriber.name else f"{tag}:{audio_hash}"
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def transcribe_audio(audio_file_path: str) -> str:
+    """Transcribe an audio file with the configured backend"""
+    audio_bytes = await asyncio.to_thread(_read_file, audio_file_path)
+    return await transcribe_bytes(audio_bytes, os.path.basename(audio_file_path))
+
+
+async def transcribe_bytes(audio_bytes: bytes, filename: str) -> str:
+    """Transcribe in-memory audio; the filename's extension tells the engine the format"""
+    transcriber = get_transcriber()
+    started = time.monotonic()
+    text = await transcriber.transcribe(audio_bytes, filename)
+    metrics.observe(f"transcription.{transcriber.name}.ms", (time.monotonic() - started) * 1000)
+    return text
@@ -0,0 +1,30 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..models import TableVersion
+
+# Logical datasets whose version feeds HTTP ETags
+QUESTIONS = "questions"
+LEADERBOARD = "leaderboard"
+
+
+def _bump(name: str):
+    return update(TableVersion).where(TableVersion.name == name).values(version=TableVersion.version + 1)
+
+
+def bump_version(db: Session, name: str) -> None:
+    """Mark a dataset as changed; call inside the writing transaction (caller commits)"""
+    if not db.execute(_bump(name)).rowcount:
+        db.add(TableVersion(name=name, version=1))
+
+
+async def bump_version_async(db: AsyncSession, name: str) -> None:
+    """bump_version for an AsyncSession"""
+    if not (await db.execute(_bump(name))).rowcount:
+        db.add(TableVersion(name=name, version=1))
+
+
+async def get_version_async(db: AsyncSession, name: str) -> int:
+    """Current version of a dataset (0 if it has never been written)"""
+    version = await db.scalar(select(TableVersion.version).where(TableVersion.name == name))
+    return version or 0
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from dotenv import load_dotenv
+from ..database import SessionLocal
+from ..models import Attempt
+from .pipeline import process_attempt
+from .transcription import close_transcriber, start_transcriber
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Number of in-process workers; set to 0 to run workers as a separate process
+ATTEMPT_WORKERS = int(os.getenv("ATTEMPT_WORKERS", "2"))
+# How often idle workers re-check the queue for jobs enqueued by other processes
+ATTEMPT_POLL_INTERVAL = float(os.getenv("ATTEMPT_POLL_INTERVAL", "2"))
+# A job held longer than this is assumed orphaned (e.g. worker crashed) and is reclaimed
+ATTEMPT_LEASE_SECONDS = int(os.getenv("ATTEMPT_LEASE_SECONDS", "600"))
+
+_wakeup: Optional[asyncio.Event] = None
+_tasks: List[asyncio.Task] = []
+
+
+def _claimable(now: datetime, stale_before: datetime):
+    # A queued retry carries its not-before time in claimed_at
+    return ((Attempt.status == "queued") & (Attempt.claimed_at.is_(None) | (Attempt.claimed_at <= now))) | (
+        (Attempt.status == "processing") & (Attempt.claimed_at < stale_before)
+    )
+
+
+def claim_next_attempt() -> Optional[int]:
+    """Atomically move the oldest runnable attempt to processing and return its id"""
+    db = SessionLocal()
+    try:
+        # Aware, to match the timestamptz column; a naive value shifts by the session time zone on Postgres
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=ATTEMPT_LEASE_SECONDS)
+        candidates = db.query(Attempt.id).filter(
+            _claimable(now, stale_before)
+        ).order_by(Attempt.id).limit(5).all()
+
+        for (attempt_id,) in candidates:
+            # Conditional update so concurrent workers (or processes) never share a job
+            claimed = db.query(Attempt).filter(
+                Attempt.id == attempt_id,
+                _claimable(now, stale_before)
+            ).update(
+                {Attempt.status: "processing", Attempt.claimed_at: now},
+                synchronize_session=False
+            )
+            db.commit()
+            if claimed:
+                return attempt_id
+        return None
+    finally:
+        db.close()
+
+
+def notify_workers() -> None:
+    """Wake idle workers after a new attempt has been enqueued"""
+    if _wakeup is not None:
+        _wakeup.set()
+
+
+async def _worker_loop(worker_id: int) -> None:
+    while True:
+        try:
+            _wakeup.clear()
+            # Off the event loop: in-process workers share it with the API
+            attempt_id = await asyncio.to_thread(claim_next_attempt)
+            if attempt_id is None:
+                try:
+                    await asyncio.wait_for(_wakeup.wait(), timeout=ATTEMPT_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await process_attempt(attempt_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Attempt worker %s crashed, restarting loop", worker_id)
+            await asyncio.sleep(ATTEMPT_POLL_INTERVAL)
+
+
+def start_workers(count: int = ATTEMPT_WORKERS) -> None:
+    """Start the background worker pool on the running event loop"""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    for worker_id in range(count):
+        _tasks.append(asyncio.create_task(_worker_loop(worker_id)))
+
+
+async def stop_workers() -> None:
+    """Cancel the worker pool; in-flight jobs are handed back to the queue"""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+
+
+async def run_forever(count: int) -> None:
+    """Run a standalone worker pool, e.g. `python -m app.services.worker`"""
+    await start_transcriber()
+    start_workers(count)
+    try:
+        await asyncio.gather(*_tasks)
+    finally:
+        await stop_workers()
+        await close_transcriber()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_forever(max(ATTEMPT_WORKERS, 1)))
@@ -0,0 +1,170 @@
+"""Fake OpenAI/Anthropic server with fault injection
+
+Serves just enough of the Whisper transcription and Claude messages APIs for the
+attempt pipeline, with configurable latency, slow outliers, error bursts and
+full outages. Claude responses take `token_latency` per chunk of text, whether
+streamed or not, and come back as a tool call when the request forces one;
+`malformed_rate` of them break the rubric schema. Run from the backend directory:
+
+    python benchmarks/fake_provider.py --port 9000 --error-rate 0.2 --slow-rate 0.05
+
+and point the API at it:
+
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 ANTHROPIC_BASE_URL=http://127.0.0.1:9000 uvicorn app.main:app
+
+Faults can be changed while it runs, e.g. simulate an outage and recovery:
+
+    curl -X POST localhost:9000/_faults -H 'content-type: application/json' -d '{"down": true}'
+    curl -X POST localhost:9000/_faults -H 'content-type: application/json' -d '{"down": false}'
+"""
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+import uvicorn
+
+app = FastAPI(title="Fake AI provider")
+
+faults = {
+    "latency": 0.05,       # Seconds added to every response
+    "token_latency": 0.02,  # Seconds to "generate" each chunk of a Claude response
+    "audio_latency": 0.0,  # Extra seconds per MB of audio transcribed (16 kHz WAV is ~2 MB/minute)
+    "slow_rate": 0.0,      # Fraction of requests that take slow_latency instead
+    "slow_latency": 10.0,
+    "error_rate": 0.0,     # Fraction of requests answered with error_status
+    "error_status": 503,
+    "malformed_rate": 0.0,  # Fraction of Claude evaluations with an out-of-range score
+    "down": False,         # Every request fails with error_status
+}
+stats = Counter()
+
+# Characters per streamed text delta, roughly a couple of tokens
+CHUNK_CHARS = 8
+
+EVALUATION = {
+    "scores": {"framework": 7, "clarity": 8, "depth": 6, "user_focus": 7, "business_acumen": 7},
+    "strengths": ["Clear structure"],
+    "improvements": ["Quantify the impact"],
+    "summary": "A solid, structured answer that could go deeper on metrics.",
+}
+
+
+async def _inject_faults(api: str):
+    """Sleep and/or return an error response according to the current fault settings"""
+    stats[f"{api}.requests"] += 1
+    slow = random.random() < faults["slow_rate"]
+    await asyncio.sleep(faults["slow_latency"] if slow else faults["latency"])
+    if faults["down"] or random.random() < faults["error_rate"]:
+        stats[f"{api}.errors"] += 1
+        status = faults["error_status"]
+        headers = {"retry-after": "1"} if status in (429, 503) else {}
+        if api == "anthropic":
+            body = {"type": "error", "error": {"type": "overloaded_error", "message": "Injected failure"}}
+        else:
+            body = {"error": {"message": "Injected failure", "type": "server_error", "code": None}}
+        return JSONResponse(body, status_code=status, headers=headers)
+    return None
+
+
+@app.post("/v1/audio/transcriptions")
+async def transcriptions(request: Request):
+    form = await request.form()
+    error = await _inject_faults("openai")
+    if error is not None:
+        return error
+    audio = form.get("file")
+    size = len(await audio.read()) if audio is not None else 0
+    await asyncio.sleep(faults["audio_latency"] * size / 1e6)
+    return {"text": f"Fake transcript of a {size} byte answer about users, metrics and trade-offs."}
+
+
+@app.post("/v1/messages")
+async def messages(request: Request):
+    body = await request.json()
+    error = await _inject_faults("anthropic")
+    if error is not None:
+        return error
+    evaluation = EVALUATION
+    if random.random() < faults["malformed_rate"]:
+        stats["anthropic.malformed"] += 1
+        evaluation = {**EVALUATION, "scores": {**EVALUATION["scores"], "depth": 11}}
+    text = json.dumps(evaluation, indent=2)
+    chunks = [text[i:i + CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)]
+    tool_choice = body.get("tool_choice") or {}
+    if tool_choice.get("type") == "tool":
+        block = {"type": "tool_use", "id": "toolu_fake", "name": tool_choice["name"], "input": evaluation}
+        stop_reason = "tool_use"
+    else:
+        block = {"type": "text", "text": text}
+        stop_reason = "end_turn"
+    message = {
+        "id": "msg_fake",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "fake"),
+        "content": [block],
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": {"input_tokens": 500, "output_tokens": len(chunks)},
+    }
+    if body.get("stream"):
+        return StreamingResponse(_stream_message(message, chunks), media_type="text/event-stream")
+    await asyncio.sleep(faults["token_latency"] * len(chunks))
+    return message
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps({'type': event, **data})}\n\n"
+
+
+async def _stream_message(message: dict, chunks: list):
+    """The Messages streaming event sequence for a single text or tool_use block"""
+    block = message["content"][0]
+    yield _sse("message_start", {"message": {**message, "content": [], "stop_reason": None,
+                                             "usage": {"input_tokens": 500, "output_tokens": 1}}})
+    if block["type"] == "tool_use":
+        start = {**block, "input": {}}
+        delta = "input_json_delta", "partial_json"
+    else:
+        start = {"type": "text", "text": ""}
+        delta = "text_delta", "text"
+    yield _sse("content_block_start", {"index": 0, "content_block": start})
+    for chunk in chunks:
+        await asyncio.sleep(faults["token_latency"])
+        yield _sse("content_block_delta", {"index": 0, "delta": {"type": delta[0], delta[1]: chunk}})
+    yield _sse("content_block_stop", {"index": 0})
+    yield _sse("message_delta", {"delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+                                 "usage": {"output_tokens": len(chunks)}})
+    yield _sse("message_stop", {})
+
+
+@app.get("/_faults")
+async def get_faults():
+    return {"faults": faults, "stats": stats}
+
+
+@app.post("/_faults")
+async def set_faults(request: Request):
+    changes = await request.json()
+    unknown = set(changes) - set(faults)
+    if unknown:
+        return JSONResponse({"detail": f"Unknown settings: {sorted(unknown)}"}, status_code=400)
+    faults.update(changes)
+    return {"faults": faults}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    for name, default in faults.items():
+        if isinstance(default, bool):
+            parser.add_argument(f"--{name.replace('_', '-')}", action="store_true")
+        else:
+            parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args()
+    faults.update({name: getattr(args, name) for name in faults})
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
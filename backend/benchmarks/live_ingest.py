@@ -0,0 +1,143 @@
+"""Live ingest benchmark
+
+Compares how long a user waits after they stop talking: recording the whole
+answer and then uploading it, versus streaming it over the live WebSocket
+while it is spoken. Start the fake provider with a transcription cost per MB,
+and the API pointed at it:
+
+    python benchmarks/fake_provider.py --audio-latency 2
+    OPENAI_BASE_URL=http://127.0.0.1:9000/v1 ANTHROPIC_BASE_URL=http://127.0.0.1:9000 uvicorn app.main:app
+
+then run from the backend directory:
+
+    python benchmarks/live_ingest.py --seconds 60 --speed 4
+
+The answer is synthetic speech-like audio (tone bursts separated by pauses),
+sent `--speed` times faster than real time.
+"""
+import argparse
+import array
+import asyncio
+import io
+import json
+import math
+import time
+import uuid
+import wave
+import httpx
+import websockets
+
+SAMPLE_RATE = 16000
+CHUNK_SECONDS = 0.1
+
+
+def _answer(seconds: float) -> bytes:
+    """Alternating 2.5 s of tone and 0.5 s of silence"""
+    samples = array.array("h")
+    for i in range(int(seconds * SAMPLE_RATE)):
+        t = i / SAMPLE_RATE
+        speaking = t % 3.0 < 2.5
+        samples.append(int(6000 * math.sin(2 * math.pi * 180 * t)) if speaking else 0)
+    return samples.tobytes()
+
+
+def _wav(pcm: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(pcm)
+    return buffer.getvalue()
+
+
+async def _wait_for(client, headers, attempt_id, done):
+    while True:
+        status = (await client.get(f"/attempts/{attempt_id}/status", headers=headers)).json()
+        if done(status):
+            return status
+        await asyncio.sleep(0.05)
+
+
+def _transcribed(status):
+    return status["stage"] in ("evaluating", "done") or status["status"] in ("completed", "failed")
+
+
+def _finished(status):
+    return status["status"] in ("completed", "failed")
+
+
+async def _upload(client, headers, question_id, pcm, speed):
+    # Recording happens first; nothing reaches the server until the user stops
+    await asyncio.sleep(len(pcm) / 2 / SAMPLE_RATE / speed)
+    stopped = time.monotonic()
+    response = await client.post(
+        "/attempts/",
+        data={"question_id": question_id},
+        files={"audio": ("answer.wav", _wav(pcm), "audio/wav")},
+        headers=headers
+    )
+    response.raise_for_status()
+    attempt_id = response.json()["id"]
+    await _wait_for(client, headers, attempt_id, _transcribed)
+    transcribed = time.monotonic() - stopped
+    await _wait_for(client, headers, attempt_id, _finished)
+    return transcribed, time.monotonic() - stopped
+
+
+async def _live(client, headers, token, question_id, pcm, speed):
+    url = str(client.base_url).replace("http", "ws", 1).rstrip("/") + "/attempts/live"
+    chunk = int(SAMPLE_RATE * CHUNK_SECONDS) * 2
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(json.dumps({"token": token, "question_id": question_id, "sample_rate": SAMPLE_RATE}))
+        assert json.loads(await ws.recv())["type"] == "ready"
+        for offset in range(0, len(pcm), chunk):
+            await ws.send(pcm[offset:offset + chunk])
+            await asyncio.sleep(CHUNK_SECONDS / speed)
+        stopped = time.monotonic()
+        await ws.send(json.dumps({"type": "stop"}))
+        segments = 0
+        while True:
+            message = json.loads(await ws.recv())
+            if message["type"] == "segment":
+                segments += 1
+            elif message["type"] == "queued":
+                break
+            else:
+                raise RuntimeError(message)
+    transcribed = time.monotonic() - stopped
+    await _wait_for(client, headers, message["attempt_id"], _finished)
+    return transcribed, time.monotonic() - stopped, segments
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.url, timeout=300) as client:
+        name = f"bench-{uuid.uuid4().hex[:8]}"
+        credentials = {"email": f"{name}@example.com", "password": "benchmark-password"}
+        (await client.post("/auth/register", json={"username": name, **credentials})).raise_for_status()
+        token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        question = await client.post(
+            "/questions/",
+            json={"title": f"Benchmark {name}", "description": "Live ingest benchmark"},
+            headers=headers
+        )
+        question_id = question.json()["id"]
+
+        # Different lengths so the transcript cache never short-circuits either path
+        upload_pcm = _answer(args.seconds)
+        live_pcm = _answer(args.seconds + 0.5)
+
+        transcribed, completed = await _upload(client, headers, question_id, upload_pcm, args.speed)
+        print(f"upload: transcript {transcribed * 1000:.0f}ms, scored {completed * 1000:.0f}ms after stop")
+        transcribed, completed, segments = await _live(client, headers, token, question_id, live_pcm, args.speed)
+        print(f"live:   transcript {transcribed * 1000:.0f}ms, scored {completed * 1000:.0f}ms after stop "
+              f"({segments} segments)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--speed", type=float, default=4.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,80 @@
+"""Login storm benchmark
+
+Measures how a cheap endpoint's latency holds up while many clients log in
+at once. Start the API first (`uvicorn app.main:app`), then run from the
+backend directory:
+
+    python benchmarks/login_storm.py --url http://127.0.0.1:8000 --concurrency 32
+
+The probe endpoint is sampled alone for a baseline, then again during the
+storm; with bcrypt isolated in its own process pool the two should be close,
+and excess logins should be shed with 503 instead of queueing.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import httpx
+
+
+def _summary(latencies):
+    if not latencies:
+        return "no samples"
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return (f"n={len(ordered)} p50={statistics.median(ordered) * 1000:.1f}ms "
+            f"p99={p99 * 1000:.1f}ms max={ordered[-1] * 1000:.1f}ms")
+
+
+async def _probe(client, path, until, latencies):
+    while time.monotonic() < until:
+        started = time.monotonic()
+        await client.get(path)
+        latencies.append(time.monotonic() - started)
+        await asyncio.sleep(0.02)
+
+
+async def _login_loop(client, credentials, until, results):
+    while time.monotonic() < until:
+        started = time.monotonic()
+        try:
+            response = await client.post("/auth/login", json=credentials)
+            outcome = response.status_code
+        except httpx.TimeoutException:
+            outcome = "timeout"
+        results.setdefault(outcome, []).append(time.monotonic() - started)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        name = f"bench-{uuid.uuid4().hex[:8]}"
+        credentials = {"email": f"{name}@example.com", "password": "benchmark-password"}
+        response = await client.post("/auth/register", json={"username": name, **credentials})
+        response.raise_for_status()
+
+        baseline = []
+        await _probe(client, args.probe, time.monotonic() + args.duration, baseline)
+        print(f"probe {args.probe} alone:        {_summary(baseline)}")
+
+        until = time.monotonic() + args.duration
+        during, logins = [], {}
+        await asyncio.gather(
+            _probe(client, args.probe, until, during),
+            *[_login_loop(client, credentials, until, logins) for _ in range(args.concurrency)]
+        )
+        print(f"probe {args.probe} during storm: {_summary(during)}")
+        for status_code, latencies in sorted(logins.items(), key=lambda item: str(item[0])):
+            print(f"login {status_code}: {_summary(latencies)} "
+                  f"({len(latencies) / args.duration:.1f}/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--probe", default="/questions/?limit=1")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""List serialization benchmark
+
+Compares the default FastAPI path for list endpoints (validate ORM rows against
+the response_model, dump to JSON-compatible data, encode with stdlib json) with
+the fast path used by the list routes (plain dicts encoded by orjson). Run from
+the backend directory:
+
+    python benchmarks/serialization.py --rows 10000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi import Response  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from app.models import Attempt, Question  # noqa: E402
+from app.responses import fast_json  # noqa: E402
+from app.routes.attempts import SUMMARY_FIELDS  # noqa: E402
+from app.schemas import AttemptListItem, QuestionResponse  # noqa: E402
+from app.services.question_cache import _snapshot  # noqa: E402
+
+
+def _questions(count: int) -> List[Question]:
+    started = datetime(2026, 1, 1)
+    return [
+        Question(
+            id=i, creator_id=i % 50, title=f"How would you grow product {i}?",
+            description="Walk through users, pain points, solutions and metrics. " * 8,
+            category=("Strategy", "Execution", "Design")[i % 3],
+            created_at=started + timedelta(seconds=i)
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _attempts(count: int) -> List[Attempt]:
+    started = datetime(2026, 1, 1)
+    return [
+        Attempt(
+            id=i, user_id=1, question_id=i % 300, score=(i % 100) / 10, status="completed",
+            created_at=started + timedelta(seconds=i)
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def _default_path(model, rows, **options) -> bytes:
+    field = create_model_field("Response", List[model], mode="serialization")
+    content = await serialize_response(field=field, response_content=rows, **options)
+    return JSONResponse(content).body
+
+
+def _fast_path(rows) -> bytes:
+    return fast_json(rows, Response()).body
+
+
+def _time(label: str, func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = func()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<10} best of {repeat}: {best * 1000:8.1f} ms  ({len(body) / 1024:.0f} KiB)")
+    return best
+
+
+def main(args) -> None:
+    questions = _questions(args.rows)
+    attempts = _attempts(args.rows)
+    cases = [
+        (
+            "questions (QuestionResponse)",
+            lambda: asyncio.run(_default_path(QuestionResponse, questions)),
+            lambda: _fast_path([_snapshot(question) for question in questions]),
+        ),
+        (
+            "attempt summaries (AttemptListItem)",
+            lambda: asyncio.run(_default_path(AttemptListItem, [
+                {name: getattr(attempt, name) for name in SUMMARY_FIELDS} for attempt in attempts
+            ], exclude_unset=True)),
+            lambda: _fast_path([{name: getattr(attempt, name) for name in SUMMARY_FIELDS} for attempt in attempts]),
+        ),
+    ]
+    for label, default, fast in cases:
+        assert default() == fast(), f"{label}: fast path output differs"
+        print(f"{label}, {args.rows} rows")
+        baseline = _time("default", default, args.repeat)
+        optimized = _time("fast", fast, args.repeat)
+        print(f"  speedup: {baseline / optimized:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
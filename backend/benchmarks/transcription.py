@@ -0,0 +1,72 @@
+"""Transcription backend benchmark
+
+Transcribes one audio file repeatedly through the configured backend and
+reports latency, throughput and real-time factor, to size
+TRANSCRIPTION_WORKERS and compare engines. Run from the backend directory:
+
+    TRANSCRIPTION_BACKEND=local TRANSCRIPTION_WORKERS=2 python benchmarks/transcription.py answer.wav --runs 8 --concurrency 2
+
+The real-time factor (processing seconds per second of audio) is shown for
+WAV input, where the duration is known without decoding.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import transcription  # noqa: E402
+
+
+def _duration(path):
+    try:
+        with wave.open(path) as w:
+            return w.getnframes() / w.getframerate()
+    except (wave.Error, EOFError):
+        return None
+
+
+async def main(args):
+    with open(args.audio, "rb") as f:
+        audio = f.read()
+    name = os.path.basename(args.audio)
+
+    started = time.monotonic()
+    await transcription.start_transcriber()
+    print(f"backend {transcription.TRANSCRIPTION_BACKEND}: ready in {time.monotonic() - started:.1f}s")
+
+    slot = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def run_once():
+        async with slot:
+            began = time.monotonic()
+            text = await transcription.transcribe_bytes(audio, name)
+            latencies.append(time.monotonic() - began)
+            return text
+
+    try:
+        began = time.monotonic()
+        texts = await asyncio.gather(*[run_once() for _ in range(args.runs)])
+        elapsed = time.monotonic() - began
+    finally:
+        await transcription.close_transcriber()
+
+    print(f"{args.runs} runs at concurrency {args.concurrency}: p50 {statistics.median(latencies):.2f}s "
+          f"max {max(latencies):.2f}s, {args.runs / elapsed:.2f} files/s")
+    duration = _duration(args.audio)
+    if duration:
+        print(f"audio {duration:.1f}s, real-time factor {statistics.median(latencies) / duration:.3f}")
+    print(f"transcript: {texts[0][:200]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("audio")
+    parser.add_argument("--runs", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=1)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEST_DIR = tempfile.mkdtemp(prefix="pm-practice-tests-")
+
+# Settings are read at import time, so they must be in place before the app is imported
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{TEST_DIR}/test.db",
+    "UPLOAD_DIR": os.path.join(TEST_DIR, "uploads"),
+    "ATTEMPT_WORKERS": "0",
+    "TRANSCRIPTION_BACKEND": "fake",
+    "AUDIO_PREPROCESS": "0",
+    "OPENAI_API_KEY": "test",
+    "ANTHROPIC_API_KEY": "test",
+})
+sys.path.insert(0, BACKEND_DIR)
+
+import pytest  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """The full migration chain, so tests see the production indexes and FTS tables"""
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.set_main_option("sqlalchemy.url", os.environ["DATABASE_URL"])
+    command.upgrade(config, "head")
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+
+def register(client, name=None):
+    """Register and log in a fresh user; returns (user_id, auth headers)"""
+    name = name or f"user-{uuid.uuid4().hex[:8]}"
+    credentials = {"email": f"{name}@example.com", "password": "test-password"}
+    user = client.post("/auth/register", json={"username": name, **credentials})
+    assert user.status_code == 201, user.text
+    token = client.post("/auth/login", json=credentials).json()["access_token"]
+    return user.json()["id"], {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,76 @@
+import uuid
+from sqlalchemy import event
+from app import auth
+from app.database import SessionLocal, engine
+from app.models import User
+from app.routes import auth as auth_routes
+from conftest import register
+
+
+def test_register_and_login_stay_off_the_sync_engine(client):
+    # The sync engine blocks whichever thread calls it; on an async route that is the event loop
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        register(client)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert statements == []
+
+
+def test_duplicate_email_or_username_is_rejected(client):
+    name = f"user-{uuid.uuid4().hex[:8]}"
+    register(client, name)
+    duplicate_email = client.post("/auth/register", json={
+        "username": f"{name}-2", "email": f"{name}@example.com", "password": "x"
+    })
+    assert duplicate_email.status_code == 400 and duplicate_email.json()["detail"] == "Email already registered"
+    duplicate_name = client.post("/auth/register", json={
+        "username": name, "email": f"{name}-2@example.com", "password": "x"
+    })
+    assert duplicate_name.status_code == 400 and duplicate_name.json()["detail"] == "Username already taken"
+
+
+def test_wrong_password_and_unknown_email_are_401(client):
+    name = f"user-{uuid.uuid4().hex[:8]}"
+    register(client, name)
+    for email, password in ((f"{name}@example.com", "wrong"), ("nobody@example.com", "test-password")):
+        response = client.post("/auth/login", json={"email": email, "password": password})
+        assert response.status_code == 401
+
+
+def test_full_hashing_queue_sheds_with_503(client, monkeypatch):
+    monkeypatch.setattr(auth, "_hash_jobs", auth.PASSWORD_HASH_WORKERS + auth.PASSWORD_HASH_QUEUE)
+    response = client.post("/auth/login", json={"email": "nobody@example.com", "password": "x"})
+    # An unknown email never reaches bcrypt, so it is still a plain 401
+    assert response.status_code == 401
+    name = f"user-{uuid.uuid4().hex[:8]}"
+    response = client.post("/auth/register", json={
+        "username": name, "email": f"{name}@example.com", "password": "x"
+    })
+    assert response.status_code == 503 and response.headers["retry-after"] == "1"
+
+
+def test_losing_a_registration_race_is_a_400(client, monkeypatch):
+    name = f"user-{uuid.uuid4().hex[:8]}"
+    hash_password = auth_routes.get_password_hash_async
+
+    async def hash_while_someone_else_registers(password):
+        # The competing request commits the same email while this one is hashing
+        db = SessionLocal()
+        try:
+            db.add(User(username=f"{name}-rival", email=f"{name}@example.com", password_hash="x"))
+            db.commit()
+        finally:
+            db.close()
+        return await hash_password(password)
+
+    monkeypatch.setattr(auth_routes, "get_password_hash_async", hash_while_someone_else_registers)
+    response = client.post("/auth/register", json={
+        "username": name, "email": f"{name}@example.com", "password": "x"
+    })
+    assert response.status_code == 400 and response.json()["detail"] == "Email already registered"
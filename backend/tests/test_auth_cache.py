@@ -0,0 +1,36 @@
+from datetime import timedelta
+from app import metrics
+from app.auth import create_access_token
+from app.database import SessionLocal
+from app.dependencies import _token_cache
+from app.models import User
+from conftest import register
+
+
+def test_verified_tokens_are_reused(client):
+    _, headers = register(client)
+    client.get("/auth/me", headers=headers)
+    hits = metrics.value("auth_cache.hits")
+    assert client.get("/auth/me", headers=headers).status_code == 200
+    assert metrics.value("auth_cache.hits") == hits + 1
+
+
+def test_user_changes_evict_their_tokens(client):
+    user_id, headers = register(client)
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    db = SessionLocal()
+    try:
+        db.get(User, user_id).username = f"renamed-{user_id}"
+        db.commit()
+    finally:
+        db.close()
+    assert client.get("/auth/me", headers=headers).json()["username"] == f"renamed-{user_id}"
+
+
+def test_expired_and_invalid_tokens_are_not_cached(client):
+    user_id, _ = register(client)
+    expired = create_access_token({"sub": str(user_id)}, expires_delta=timedelta(seconds=-1))
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {expired}"}).status_code == 401
+    assert client.get("/auth/me", headers={"Authorization": "Bearer not-a-token"}).status_code == 401
+    assert _token_cache.get(expired) is None and _token_cache.get("not-a-token") is None
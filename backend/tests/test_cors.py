@@ -0,0 +1,17 @@
+from app.services.storage import max_upload_bytes
+
+ORIGIN = "http://localhost:5173"
+
+
+def test_upload_too_large_is_readable_cross_origin(client):
+    body = bytes(max_upload_bytes() + 1024 * 1024 + 1)
+    response = client.post("/attempts/", content=body, headers={"Origin": ORIGIN})
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+
+
+def test_preflight_is_answered_by_cors(client):
+    response = client.options("/attempts/", headers={
+        "Origin": ORIGIN, "Access-Control-Request-Method": "POST"
+    })
+    assert response.status_code == 200 and response.headers["access-control-allow-origin"] == ORIGIN
@@ -0,0 +1,23 @@
+import importlib.util
+import pytest
+from app.database import async_database_url
+
+
+def test_sync_urls_map_to_their_async_drivers(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: object())
+    assert async_database_url("sqlite:///./pm.db") == "sqlite+aiosqlite:///./pm.db"
+    assert async_database_url("postgresql://app:secret@db:5432/pm") == "postgresql+asyncpg://app:secret@db:5432/pm"
+    assert async_database_url("postgresql+psycopg2://app@db/pm") == "postgresql+asyncpg://app@db/pm"
+
+
+def test_unsupported_database_is_a_clear_error():
+    with pytest.raises(RuntimeError, match="Unsupported database 'mysql'"):
+        async_database_url("mysql://app@db/pm")
+
+
+def test_missing_driver_is_named(monkeypatch):
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, "find_spec",
+                        lambda name: None if name == "asyncpg" else real_find_spec(name))
+    with pytest.raises(RuntimeError, match="pip install asyncpg"):
+        async_database_url("postgresql://app@db/pm")
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app import metrics
+from app.services import evaluation
+from app.services.evaluation import TOOL_NAME, EvaluationParseError, _tool_input, evaluate_pm_answer
+
+VALID = {
+    "scores": {"framework": 8, "clarity": 7, "depth": 6, "user_focus": 9, "business_acumen": 7},
+    "strengths": ["Clear structure"],
+    "improvements": ["More metrics"],
+    "summary": "A solid answer.",
+}
+# depth out of range, summary missing
+INVALID = {**VALID, "scores": {**VALID["scores"], "depth": 11}, "summary": ""}
+
+
+def tool_call(payload):
+    return SimpleNamespace(content=[SimpleNamespace(type="tool_use", name=TOOL_NAME, input=payload)])
+
+
+def text(body):
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=body)])
+
+
+@pytest.fixture
+def replies(monkeypatch):
+    """Queue of messages the fake Claude returns; records the model of each request"""
+    queue, models = [], []
+
+    async def create(**kwargs):
+        models.append(kwargs["model"])
+        return queue.pop(0)
+
+    client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    monkeypatch.setattr(evaluation, "get_anthropic_client", lambda: client)
+    return SimpleNamespace(queue=queue, models=models)
+
+
+def _evaluate():
+    return asyncio.run(evaluate_pm_answer("Title", "Description", "Transcript"))
+
+
+def test_valid_tool_call_gets_a_computed_overall_score(replies):
+    replies.queue.append(tool_call({**VALID, "overall_score": 1.0}))
+    parsed = metrics.value("evaluation.parsed")
+    result = _evaluate()
+    assert result["overall_score"] == 7.4  # From the five scores, not from the model
+    assert result["scores"] == VALID["scores"] and replies.models == [evaluation.EVALUATION_MODEL]
+    assert metrics.value("evaluation.parsed") == parsed + 1
+
+
+@pytest.mark.parametrize("body", [
+    '{"scores": {"framework": 8, "clarity": 7, "depth": 6, "user_focus": 9, "business_acumen": 7}, '
+    '"strengths": ["Clear structure"], "improvements": ["More metrics"], "summary": "A solid answer."}',
+    'Here it is:\n```json\n{"scores": {"framework": 8, "clarity": 7, "depth": 6, "user_focus": 9, '
+    '"business_acumen": 7}, "strengths": ["Clear structure"], "improvements": ["More metrics"], '
+    '"summary": "A solid answer."}\n```',
+])
+def test_json_written_as_text_is_accepted(body):
+    assert _tool_input(text(body)) == VALID
+
+
+def test_invalid_output_is_repaired_by_the_repair_model(replies):
+    replies.queue += [tool_call(INVALID), tool_call(VALID)]
+    failures, repaired = metrics.value("evaluation.parse_failures"), metrics.value("evaluation.repaired")
+    assert _evaluate()["overall_score"] == 7.4
+    assert replies.models == [evaluation.EVALUATION_MODEL, evaluation.EVALUATION_REPAIR_MODEL]
+    assert metrics.value("evaluation.parse_failures") == failures + 1
+    assert metrics.value("evaluation.repaired") == repaired + 1
+
+
+def test_failed_repair_is_a_parse_error(replies):
+    replies.queue += [tool_call(INVALID), tool_call(INVALID)]
+    repair_failures = metrics.value("evaluation.repair_failures")
+    with pytest.raises(EvaluationParseError):
+        _evaluate()
+    assert metrics.value("evaluation.repair_failures") == repair_failures + 1
+
+
+def test_empty_output_is_not_sent_for_repair(replies):
+    replies.queue.append(text(""))
+    with pytest.raises(EvaluationParseError):
+        _evaluate()
+    assert replies.models == [evaluation.EVALUATION_MODEL]
+
+
+def test_repair_can_be_turned_off(replies, monkeypatch):
+    monkeypatch.setattr(evaluation, "EVALUATION_REPAIR_MODEL", "")
+    replies.queue.append(tool_call(INVALID))
+    with pytest.raises(EvaluationParseError):
+        _evaluate()
+    assert len(replies.models) == 1
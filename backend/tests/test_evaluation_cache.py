@@ -0,0 +1,40 @@
+import uuid
+from app.database import SessionLocal
+from app.services import evaluation_cache
+from app.services.evaluation_cache import evaluation_cache_key, get_cached_evaluation, store_evaluation
+
+
+def test_key_ignores_whitespace_but_not_content():
+    key = evaluation_cache_key("Title", "Description", "I would  start\nwith users.")
+    assert key == evaluation_cache_key("Title", "Description", " I would start with users. ")
+    assert key != evaluation_cache_key("Title", "Description", "I would start with metrics.")
+    assert key != evaluation_cache_key("Other title", "Description", "I would start with users.")
+
+
+def test_memory_then_database_tier():
+    key = uuid.uuid4().hex
+    result = {"overall_score": 7.0}
+    db = SessionLocal()
+    try:
+        assert get_cached_evaluation(db, key) is None
+        store_evaluation(db, key, result)
+        assert get_cached_evaluation(db, key) == result
+
+        # A fresh process (empty memory tier) still finds it in the table
+        evaluation_cache._memory.clear()
+        assert get_cached_evaluation(db, key) == result
+        assert evaluation_cache._memory.get(key) == result
+    finally:
+        db.close()
+
+
+def test_storing_the_same_key_twice_is_harmless():
+    key = uuid.uuid4().hex
+    db = SessionLocal()
+    try:
+        store_evaluation(db, key, {"overall_score": 6.0})
+        store_evaluation(db, key, {"overall_score": 6.0})
+        evaluation_cache._memory.clear()
+        assert get_cached_evaluation(db, key) == {"overall_score": 6.0}
+    finally:
+        db.close()
@@ -0,0 +1,20 @@
+from conftest import register
+
+
+def test_unchanged_question_is_a_304(client):
+    _, headers = register(client)
+    question_id = client.post("/questions/", json={"title": "Q", "description": "D"}, headers=headers).json()["id"]
+    first = client.get(f"/questions/{question_id}")
+    etag = first.headers["etag"]
+    assert client.get(f"/questions/{question_id}", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/questions/{question_id}", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    client.put(f"/questions/{question_id}", json={"title": "Changed"}, headers=headers)
+    assert client.get(f"/questions/{question_id}", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_missing_question_is_a_404_whatever_the_tag(client):
+    etag = client.get("/questions/", params={"limit": 1}).headers["etag"]
+    for tag in ("*", etag):
+        assert client.get("/questions/999999999", headers={"If-None-Match": tag}).status_code == 404
+    assert client.get("/questions/", params={"limit": 1}, headers={"If-None-Match": etag}).status_code == 304
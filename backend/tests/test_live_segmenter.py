@@ -0,0 +1,72 @@
+import asyncio
+import io
+import wave
+from array import array
+from app.services.live import LiveSession, Segmenter, wav_bytes
+
+RATE = 8000
+
+
+def speech(seconds):
+    return array("h", [4000, -4000] * int(RATE * seconds / 2)).tobytes()
+
+
+def silence(seconds):
+    return bytes(int(RATE * seconds) * 2)
+
+
+def seconds(segment):
+    return len(segment) / 2 / RATE
+
+
+def test_cuts_at_the_first_pause_after_the_minimum():
+    segmenter = Segmenter(RATE)
+    # The early pause is ignored; the one after LIVE_MIN_SEGMENT_SECONDS (5s) ends the segment
+    [(segment, voiced)] = segmenter.feed(speech(2) + silence(1) + speech(4) + silence(0.5) + speech(2))
+    assert voiced and seconds(segment) == 7.3  # Cut once LIVE_SILENCE_SECONDS (0.3s) of pause is seen
+    trailing, voiced = segmenter.flush()
+    assert voiced and seconds(trailing) == 2.2
+
+
+def test_cuts_unbroken_speech_at_the_maximum():
+    segmenter = Segmenter(RATE)
+    [(segment, _)] = segmenter.feed(speech(20))
+    assert seconds(segment) == 15
+    assert seconds(segmenter.flush()[0]) == 5
+    assert segmenter.flush() is None
+
+
+def test_silence_is_flagged_and_chunking_does_not_matter():
+    pcm = silence(6) + speech(6) + silence(1)
+    whole = Segmenter(RATE).feed(pcm)
+
+    chunked, segmenter = [], Segmenter(RATE)
+    for start in range(0, len(pcm), 1000):  # Chunks that straddle frame boundaries
+        chunked += segmenter.feed(pcm[start:start + 1000])
+    assert chunked == whole
+    assert [(seconds(segment), voiced) for segment, voiced in whole] == [(5.0, False), (7.3, True)]
+
+
+def test_wav_bytes_round_trip():
+    pcm = speech(0.5)
+    with wave.open(io.BytesIO(wav_bytes(pcm, RATE))) as w:
+        assert (w.getnchannels(), w.getsampwidth(), w.getframerate()) == (1, 2, RATE)
+        assert w.readframes(w.getnframes()) == pcm
+
+
+def test_session_skips_silent_segments_and_stitches_the_rest():
+    heard = []
+
+    async def on_segment(index, text):
+        heard.append(index)
+
+    async def run():
+        session = LiveSession(RATE, on_segment)
+        await session.open()
+        for pcm in (speech(6) + silence(0.5), silence(6), speech(3)):
+            await session.feed(pcm)
+        return await session.finish()
+
+    stored, transcript = asyncio.run(run())
+    assert heard == [0, 1]  # The silent middle segment never reached the transcriber
+    assert stored.size > 0 and transcript and transcript.count(".") == 2
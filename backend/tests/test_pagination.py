@@ -0,0 +1,75 @@
+import uuid
+import pytest
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from conftest import register
+
+
+def _pages(client, path, params, headers=None):
+    """Follow X-Next-Cursor to the end; returns the pages' ids"""
+    pages, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(["2026-01-01T00:00:00", 42])) == ["2026-01-01T00:00:00", 42]
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_cursor({"a": 1}), "e30"])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_question_pages_cover_every_row_once_in_order(client):
+    _, headers = register(client)
+    category = f"paging-{uuid.uuid4().hex[:8]}"
+    # Created within the same second, so most rows tie on created_at and the id breaks the tie
+    ids = [
+        client.post("/questions/", json={"title": f"Q{i}", "description": "D", "category": category},
+                    headers=headers).json()["id"]
+        for i in range(7)
+    ]
+    pages = _pages(client, "/questions/", {"category": category, "limit": 3})
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [item for page in pages for item in page] == ids
+
+
+def test_attempt_pages_are_newest_first_and_scoped_to_the_user(client):
+    _, headers = register(client)
+    _, other_headers = register(client)
+    question_id = client.post("/questions/", json={"title": "Q", "description": "D"}, headers=headers).json()["id"]
+
+    def upload(auth, i):
+        response = client.post(
+            "/attempts/",
+            data={"question_id": question_id},
+            files={"audio": (f"a{i}.webm", uuid.uuid4().bytes * 100, "audio/webm")},
+            headers=auth
+        )
+        assert response.status_code == 202, response.text
+        return response.json()["id"]
+
+    ids = [upload(headers, i) for i in range(5)]
+    upload(other_headers, 0)
+    pages = _pages(client, "/attempts/", {"limit": 2}, headers)
+    assert [item for page in pages for item in page] == ids[::-1]
+
+
+def test_invalid_cursor_is_a_400(client):
+    _, headers = register(client)
+    assert client.get("/questions/", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/attempts/", params={"cursor": encode_cursor(["x"])}, headers=headers).status_code == 400
+
+
+@pytest.mark.parametrize("values", [[5, 1], [True, 1], [["2026-01-01"], 1], ["2026-01-01T00:00:00", True],
+                                    ["2026-01-01T00:00:00", "1"], ["not a date", 1]])
+def test_cursors_with_wrongly_typed_values_are_a_400(client, values):
+    _, headers = register(client)
+    assert client.get("/questions/", params={"cursor": encode_cursor(values)}).status_code == 400
+    assert client.get("/attempts/", params={"cursor": encode_cursor(values)}, headers=headers).status_code == 400
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+import pytest
+from app.database import SessionLocal
+from app.models import Attempt, Question
+from app.services import pipeline
+from app.services.resilience import ProviderError
+from conftest import register
+
+EVALUATION = {"overall_score": 7.0, "summary": "Fine"}
+
+
+@pytest.fixture(autouse=True)
+def fake_evaluation(monkeypatch):
+    async def evaluate(*args, **kwargs):
+        return EVALUATION
+
+    monkeypatch.setattr(pipeline, "evaluate_pm_answer", evaluate)
+
+
+def _seed(client, **fields):
+    """A claimed attempt that already has its transcript, so only evaluation is left"""
+    user_id, _ = register(client)
+    db = SessionLocal()
+    try:
+        question = Question(creator_id=user_id, title="Q", description="D")
+        db.add(question)
+        db.flush()
+        fields = {"status": "processing", "claimed_at": datetime.now(timezone.utc), **fields}
+        attempt = Attempt(user_id=user_id, question_id=question.id, transcript=uuid.uuid4().hex, **fields)
+        db.add(attempt)
+        db.commit()
+        return attempt.id
+    finally:
+        db.close()
+
+
+def _row(attempt_id):
+    db = SessionLocal()
+    try:
+        attempt = db.get(Attempt, attempt_id)
+        return attempt.status, attempt.stage, attempt.score
+    finally:
+        db.close()
+
+
+def test_cancelled_after_scoring_stays_completed(client, monkeypatch):
+    attempt_id = _seed(client)
+    saved = threading.Event()
+    save_result = pipeline._save_result
+
+    def save_then_stall(db, attempt, evaluation):
+        scored = save_result(db, attempt, evaluation)
+        saved.set()
+        time.sleep(0.2)  # Shutdown cancels the worker while this step is still running
+        return scored
+
+    monkeypatch.setattr(pipeline, "_save_result", save_then_stall)
+
+    async def run():
+        task = asyncio.create_task(pipeline.process_attempt(attempt_id))
+        await asyncio.to_thread(saved.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert _row(attempt_id) == ("completed", "done", 7.0)
+
+
+def test_reclaimed_scored_attempt_is_completed(client):
+    attempt_id = _seed(client, score=7.0, feedback=EVALUATION, stage="evaluating")
+    asyncio.run(pipeline.process_attempt(attempt_id))
+    assert _row(attempt_id) == ("completed", "done", 7.0)
+
+
+@pytest.mark.parametrize("fail", [
+    lambda db, attempt: pipeline._mark_failed(db, attempt, RuntimeError("boom")),
+    lambda db, attempt: pipeline._after_provider_error(db, attempt, ProviderError("anthropic", "down", retryable=True)),
+    lambda db, attempt: pipeline._after_provider_error(db, attempt, ProviderError("anthropic", "bad", retryable=False)),
+    pipeline._hand_back,
+])
+def test_a_duplicate_job_cannot_undo_a_score(client, fail):
+    attempt_id = _seed(client, score=7.0, status="completed", stage="done")
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        assert fail(db, db.get(Attempt, attempt_id)) is False
+    finally:
+        db.close()
+    assert _row(attempt_id) == ("completed", "done", 7.0)
+
+
+def test_claim_times_are_timezone_aware(monkeypatch):
+    # claimed_at is timestamptz; naive values are read in the Postgres session's time zone
+    monkeypatch.setattr(pipeline, "ATTEMPT_RETRY_DELAY", 60)
+    retry_at = pipeline._retry_at(1)
+    assert retry_at.tzinfo is timezone.utc and retry_at > datetime.now(timezone.utc)
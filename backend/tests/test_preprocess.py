@@ -0,0 +1,74 @@
+import asyncio
+import sys
+import pytest
+from app import metrics
+from app.services import preprocess, storage
+
+# Stands in for ffmpeg: "decodes" by copying the file (honouring -t at 16 kHz mono s16le)
+# and "encodes" by halving what it reads, reporting the input length as its progress
+FAKE_FFMPEG = f"""#!{sys.executable}
+import sys
+args = sys.argv[1:]
+if args[-1] == "pipe:1":
+    path = args[args.index("-i") + 1]
+    if "broken" in path:
+        sys.exit("Invalid data found when processing input")
+    limit = int(float(args[args.index("-t") + 1]) * 32000)
+    with open(path, "rb") as f:
+        data = f.read()[:limit]
+    for start in range(0, len(data), 4096):
+        sys.stdout.buffer.write(data[start:start + 4096])
+else:
+    data = sys.stdin.buffer.read()
+    with open(args[-1], "wb") as f:
+        f.write(data[:len(data) // 2])
+    print(f"out_time_us={{len(data) * 1000000 // 32000}}\\nprogress=end")
+"""
+
+
+@pytest.fixture
+def ffmpeg(tmp_path, monkeypatch):
+    path = tmp_path / "ffmpeg"
+    path.write_text(FAKE_FFMPEG)
+    path.chmod(0o755)
+    monkeypatch.setattr(preprocess, "AUDIO_PREPROCESS", True)
+    monkeypatch.setattr(preprocess, "FFMPEG_PATH", str(path))
+    return tmp_path
+
+
+def _prepare(path):
+    return asyncio.run(preprocess.prepare_audio(str(path)))
+
+
+def test_pcm_streams_from_decoder_to_encoder(ffmpeg):
+    upload = ffmpeg / "answer.webm"
+    upload.write_bytes(bytes(32000 * 3))
+    prepared = _prepare(upload)
+    try:
+        assert prepared.temporary and prepared.path.endswith(".ogg")
+        assert (prepared.audio_seconds, prepared.speech_seconds) == (3.0, 3.0)
+        assert prepared.processed_bytes == 32000 * 3 // 2
+    finally:
+        prepared.cleanup()
+
+
+def test_decoding_stops_at_the_duration_limit(ffmpeg, monkeypatch):
+    monkeypatch.setattr(storage, "MAX_AUDIO_SECONDS", 2)
+    upload = ffmpeg / "long.webm"
+    upload.write_bytes(bytes(32000 * 5))
+    truncated = metrics.value("preprocess.truncated")
+    prepared = _prepare(upload)
+    try:
+        assert prepared.audio_seconds == 2.0 and prepared.speech_seconds == 2.0
+        assert metrics.value("preprocess.truncated") == truncated + 1
+    finally:
+        prepared.cleanup()
+
+
+def test_undecodable_upload_is_sent_as_is(ffmpeg):
+    upload = ffmpeg / "broken.webm"
+    upload.write_bytes(b"not audio")
+    failures = metrics.value("preprocess.failures")
+    prepared = _prepare(upload)
+    assert prepared.path == str(upload) and not prepared.temporary
+    assert metrics.value("preprocess.failures") == failures + 1
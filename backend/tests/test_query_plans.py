@@ -0,0 +1,132 @@
+import asyncio
+import re
+import pytest
+from sqlalchemy import event
+from app.database import async_engine, engine, read_engine
+from app.services import pipeline
+from app.services.ranking import rank_index
+from app.services.worker import claim_next_attempt
+from conftest import register
+
+# Reads of a whole table that are whole-table by design, matched against the SQL
+INTENTIONAL_SCANS = {
+    # The in-process rank index loads every ranked user once, then refreshes periodically
+    "rank index load": re.compile(
+        r"^SELECT user_stats\.user_id, user_stats\.avg_score, user_stats\.scored_attempts\s+FROM user_stats"
+    ),
+}
+
+
+@pytest.fixture
+def captured():
+    """Every SELECT/UPDATE/DELETE sent to any engine while the test runs"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            statements.append((statement, parameters))
+
+    targets = {engine, async_engine.sync_engine, read_engine.sync_engine}
+    for target in targets:
+        event.listen(target, "before_cursor_execute", record)
+    yield statements
+    for target in targets:
+        event.remove(target, "before_cursor_execute", record)
+
+
+def _plan(statement, parameters):
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+def _scans(statement, plan):
+    """Plan steps that read a table or index from one end instead of seeking into it"""
+    bounded = re.search(r"\bLIMIT\b", statement) is not None
+    scans = []
+    for step in plan:
+        if not step.startswith("SCAN "):
+            continue
+        # Walking an index in ORDER BY order stops after LIMIT rows; anything else reads it all
+        if bounded and " USING " in step and "INDEX" in step:
+            continue
+        # FTS5 reports a MATCH answered from its own index as a virtual table "scan" with M in idxStr
+        if re.search(r"VIRTUAL TABLE INDEX \d+:\S*M", step):
+            continue
+        scans.append(step)
+    return scans
+
+
+def _exercise_routes(client):
+    _, headers = register(client)
+    friend_id, friend_headers = register(client)
+
+    # Questions: create, list (first and later pages, by category), fetch, search
+    for i in range(3):
+        created = client.post("/questions/", json={
+            "title": f"Design a pricing page {i}",
+            "description": "How would you improve conversion?",
+            "category": "Product Design"
+        }, headers=headers)
+        assert created.status_code == 201
+    question_id = created.json()["id"]
+    page = client.get("/questions/", params={"limit": 2})
+    client.get("/questions/", params={"limit": 2, "cursor": page.headers["X-Next-Cursor"]})
+    client.get("/questions/", params={"category": "Product Design", "limit": 2})
+    client.get(f"/questions/{question_id}")
+    assert client.get("/questions/search", params={"q": "pricing"}).status_code == 200
+
+    # Friends: request, accept, list both sides
+    request = client.post("/friends/request", json={"friend_id": friend_id}, headers=headers)
+    client.get("/friends/requests", headers=friend_headers)
+    client.post(f"/friends/{request.json()['id']}/accept", headers=friend_headers)
+    client.get("/friends/", headers=headers)
+
+    # Attempts: upload, claim and score through the worker path, then every read
+    attempt_ids = []
+    for i in range(3):
+        attempt = client.post(
+            "/attempts/",
+            data={"question_id": question_id},
+            files={"audio": (f"answer{i}.webm", bytes([i + 1]) * 4000, "audio/webm")},
+            headers=headers
+        )
+        assert attempt.status_code == 202, attempt.text
+        attempt_ids.append(attempt.json()["id"])
+    while (claimed := claim_next_attempt()) is not None:
+        asyncio.run(pipeline.process_attempt(claimed))
+    page = client.get("/attempts/", params={"limit": 2}, headers=headers)
+    client.get("/attempts/", params={"limit": 2, "cursor": page.headers["X-Next-Cursor"]}, headers=headers)
+    client.get(f"/attempts/{attempt_ids[0]}", headers=headers)
+    client.get(f"/attempts/{attempt_ids[0]}/status", headers=headers)
+    assert "event: completed" in client.get(f"/attempts/{attempt_ids[0]}/stream", headers=headers).text
+
+    # Leaderboards: global, friends (IN filter), rank index windows
+    rank_index.invalidate()
+    client.get("/leaderboard/global")
+    client.get("/leaderboard/friends", headers=headers)
+    client.get("/leaderboard/global/window", params={"limit": 1})
+    client.get("/leaderboard/me", headers=headers)
+
+
+def test_router_queries_use_indexes(client, captured, monkeypatch):
+    async def evaluate(title, description, transcript, on_text=None):
+        return {"scores": {}, "overall_score": 7.0, "strengths": [], "improvements": [], "summary": "ok"}
+
+    monkeypatch.setattr(pipeline, "evaluate_pm_answer", evaluate)
+    _exercise_routes(client)
+    assert len(captured) > 30
+
+    failures = []
+    for statement, parameters in captured:
+        if any(pattern.search(statement) for pattern in INTENTIONAL_SCANS.values()):
+            continue
+        plan = _plan(statement, parameters)
+        scans = _scans(statement, plan)
+        if scans:
+            failures.append(f"{' '.join(statement.split())}\n    " + "\n    ".join(plan))
+    assert not failures, "Full scans:\n" + "\n".join(dict.fromkeys(failures))
@@ -0,0 +1,68 @@
+from app import metrics
+from app.cache import LRUCache
+from app.database import SessionLocal
+from app.models import Question
+from app.services import question_cache
+from app.services.versions import QUESTIONS, bump_version
+from conftest import register
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+
+
+def test_lru_entries_expire():
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("kept", 1)
+    cache.set("stale", 2, ttl=-1)
+    assert cache.get("kept") == 1 and cache.get("stale", "gone") == "gone"
+    assert len(cache) == 1
+
+
+def test_lru_discard_where():
+    cache = LRUCache(maxsize=10)
+    for i in range(5):
+        cache.set(i, i * i)
+    assert cache.discard_where(lambda key, value: value > 3) == 3
+    assert [cache.get(i) for i in range(5)] == [0, 1, None, None, None]
+
+
+def _create(client, headers):
+    response = client.post("/questions/", json={"title": "Cached", "description": "D"}, headers=headers)
+    return response.json()["id"]
+
+
+def test_reads_go_through_the_cache_and_updates_invalidate(client):
+    _, headers = register(client)
+    question_id = _create(client, headers)
+    client.get(f"/questions/{question_id}")
+    hits = metrics.value("question_cache.hits")
+    assert client.get(f"/questions/{question_id}").json()["title"] == "Cached"
+    assert metrics.value("question_cache.hits") == hits + 1
+
+    client.put(f"/questions/{question_id}", json={"title": "Renamed"}, headers=headers)
+    assert client.get(f"/questions/{question_id}").json()["title"] == "Renamed"
+
+
+def test_writes_from_another_process_flush_the_cache(client, monkeypatch):
+    _, headers = register(client)
+    question_id = _create(client, headers)
+    assert client.get(f"/questions/{question_id}").json()["title"] == "Cached"
+
+    # Another process writes and bumps the version, without touching this process's cache
+    db = SessionLocal()
+    try:
+        db.get(Question, question_id).title = "Elsewhere"
+        bump_version(db, QUESTIONS)
+        db.commit()
+    finally:
+        db.close()
+    flushes = metrics.value("question_cache.flushes")
+    monkeypatch.setattr(question_cache, "_polled_at", 0.0)  # The poll interval has passed
+    assert client.get(f"/questions/{question_id}").json()["title"] == "Elsewhere"
+    assert metrics.value("question_cache.flushes") == flushes + 1
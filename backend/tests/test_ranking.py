@@ -0,0 +1,82 @@
+import asyncio
+from collections import namedtuple
+from app.services.ranking import RankIndex
+
+Row = namedtuple("Row", "user_id avg_score scored_attempts")
+
+
+class FakeSession:
+    """Stands in for the AsyncSession; counts the user_stats loads"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.loads = 0
+
+    async def execute(self, statement):
+        self.loads += 1
+        rows = self.rows
+
+        class Result:
+            def all(self):
+                return list(rows)
+
+        return Result()
+
+
+def _loaded(rows):
+    index = RankIndex()
+    asyncio.run(index.ensure_loaded(FakeSession(rows)))
+    return index
+
+
+def test_ranks_best_average_first_with_ties_by_user_id():
+    index = _loaded([Row(1, 6.0, 2), Row(2, 8.5, 1), Row(3, 8.5, 4), Row(4, 7.0, 3)])
+    assert [user_id for _, user_id, _, _ in index.window(0, 10)] == [2, 3, 4, 1]
+    assert [index.rank(user_id) for user_id in (2, 3, 4, 1)] == [1, 2, 3, 4]
+    assert index.rank(99) is None
+    assert len(index) == 4
+
+
+def test_windows_page_through_everyone_exactly_once():
+    index = _loaded([Row(user_id, float(user_id % 7), 1) for user_id in range(1, 51)])
+    seen, start = [], 0
+    while True:
+        window = index.window(start, 8)
+        if not window:
+            break
+        seen.extend(user_id for _, user_id, _, _ in window)
+        _, last_user_id, last_score, _ = window[-1]
+        start = index.position_after(last_score, last_user_id)
+    assert sorted(seen) == list(range(1, 51))
+    assert len(seen) == len(set(seen))
+
+
+def test_update_moves_inserts_and_removes_users():
+    index = _loaded([Row(1, 9.0, 1), Row(2, 5.0, 1)])
+    index.update(2, 9.5, 2)
+    assert index.rank(2) == 1 and index.rank(1) == 2
+    assert index.window(0, 1) == [(1, 2, 9.5, 2)]
+    index.update(3, 7.0, 1)
+    assert index.rank(3) == 3 and len(index) == 3
+    index.update(1, None, 0)
+    assert index.rank(1) is None and len(index) == 2
+
+
+def test_update_before_first_load_is_left_to_the_load():
+    index = RankIndex()
+    index.update(1, 9.0, 1)
+    assert len(index) == 0 and index.rank(1) is None
+
+
+def test_reloads_only_when_stale_or_invalidated():
+    session = FakeSession([Row(1, 7.0, 1)])
+    index = RankIndex()
+    asyncio.run(index.ensure_loaded(session))
+    asyncio.run(index.ensure_loaded(session))
+    assert session.loads == 1
+
+    session.rows = [Row(1, 7.0, 1), Row(2, 8.0, 1)]
+    index.invalidate()
+    asyncio.run(index.ensure_loaded(session))
+    assert session.loads == 2
+    assert index.rank(2) == 1
@@ -0,0 +1,36 @@
+import asyncio
+from app.middleware import ReadYourWritesMiddleware, wrote_recently
+
+
+def _scope(method, token=None, client=("10.0.0.1", 5000)):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return {"type": "http", "method": method, "path": "/questions/", "headers": headers, "client": client}
+
+
+def _call(scope, status=201):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    asyncio.run(ReadYourWritesMiddleware(app)(scope, receive, send))
+
+
+def test_writer_is_pinned_but_not_others_behind_the_same_address():
+    _call(_scope("POST", token="writer-token"))
+    assert wrote_recently(_scope("GET", token="writer-token"))
+    # Same proxy/NAT address, different or no credentials: still free to use the replica
+    assert not wrote_recently(_scope("GET", token="someone-else"))
+    assert not wrote_recently(_scope("GET"))
+
+
+def test_reads_and_failed_writes_do_not_pin():
+    _call(_scope("GET", token="reader-token"), status=200)
+    _call(_scope("POST", token="failed-token"), status=400)
+    assert not wrote_recently(_scope("GET", token="reader-token"))
+    assert not wrote_recently(_scope("GET", token="failed-token"))
@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+import pytest
+from app import metrics
+from app.services import resilience
+from app.services.resilience import CircuitBreaker, ProviderError, ProviderUnavailable, call_provider
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0)
+
+
+def _provider():
+    # Breakers are process-wide, so each test gets its own provider
+    return f"test-{uuid.uuid4().hex[:8]}"
+
+
+def _run(provider, call, **kwargs):
+    return asyncio.run(call_provider(provider, call, timeout=kwargs.pop("timeout", 1), deadline=5, **kwargs))
+
+
+def test_retryable_errors_are_retried_then_succeed():
+    provider, calls = _provider(), []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise asyncio.TimeoutError()
+        return "ok"
+
+    assert _run(provider, flaky) == "ok"
+    assert len(calls) == 3 and metrics.value(f"provider.{provider}.retries") == 2
+
+
+def test_bad_requests_fail_at_once_without_tripping_the_breaker():
+    provider, calls = _provider(), []
+
+    async def rejected():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ProviderError) as error:
+        _run(provider, rejected)
+    assert not error.value.retryable and len(calls) == 1
+    assert resilience.get_breaker(provider).failures == 0
+
+
+def test_breaker_opens_then_lets_one_trial_through():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    breaker.before_call()  # Still closed after one failure
+    breaker.record_failure()
+    with pytest.raises(ProviderUnavailable):
+        breaker.before_call()
+
+    breaker.opened_at -= 30  # The reset window passes
+    breaker.before_call()  # Half-open: the trial call goes through...
+    with pytest.raises(ProviderUnavailable):
+        breaker.before_call()  # ...and concurrent callers still fail fast
+    breaker.record_success()
+    breaker.before_call()
+    assert breaker.failures == 0 and breaker.opened_at is None
+
+
+def test_open_circuit_skips_the_provider():
+    provider, calls = _provider(), []
+    breaker = resilience.get_breaker(provider)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    async def call():
+        calls.append(1)
+        return "ok"
+
+    with pytest.raises(ProviderUnavailable):
+        _run(provider, call)
+    assert calls == []
+
+
+def test_hedge_wins_when_the_first_request_stalls():
+    provider, started = _provider(), []
+
+    async def call():
+        started.append(1)
+        await asyncio.sleep(10 if len(started) == 1 else 0)
+        return len(started)
+
+    assert _run(provider, call, hedge_after=0.05) == 2
+    assert metrics.value(f"provider.{provider}.hedges") == 1
+    assert metrics.value(f"provider.{provider}.hedge_wins") == 1
+
+
+def test_no_hedge_when_the_first_request_is_quick():
+    provider, started = _provider(), []
+
+    async def call():
+        started.append(1)
+        return "ok"
+
+    assert _run(provider, call, hedge_after=0.5) == "ok"
+    assert len(started) == 1 and metrics.value(f"provider.{provider}.hedges") == 0
+
+
+def test_timeouts_give_up_as_retryable():
+    provider = _provider()
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    with pytest.raises(ProviderError) as error:
+        _run(provider, hang, timeout=0.05, max_attempts=2)
+    assert error.value.retryable and metrics.value(f"provider.{provider}.timeouts") == 2
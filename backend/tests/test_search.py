@@ -0,0 +1,61 @@
+import asyncio
+import uuid
+from app.database import AsyncSessionLocal
+from app.models import Question
+from app.services.search import _ilike_search
+from conftest import register
+
+
+def _create(client, headers, title, description):
+    response = client.post("/questions/", json={"title": title, "description": description}, headers=headers)
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_full_text_search_ranks_title_matches_first(client):
+    _, headers = register(client)
+    word = f"zebra{uuid.uuid4().hex[:6]}"
+    in_description = _create(client, headers, "Grow a marketplace", f"Think about {word} sellers")
+    in_title = _create(client, headers, f"Launch {word} insurance", "Who is the customer?")
+
+    results = client.get("/questions/search", params={"q": word[:-2]}).json()  # Prefix match
+    assert [result["id"] for result in results] == [in_title, in_description]
+    assert "<mark>" in results[0]["snippet"]
+
+
+def test_snippets_escape_markup_from_questions(client):
+    _, headers = register(client)
+    word = f"lynx{uuid.uuid4().hex[:6]}"
+    _create(client, headers, f"<script>alert(1)</script> {word}", "Tom & Jerry's <b>pricing</b>")
+
+    [result] = client.get("/questions/search", params={"q": word}).json()
+    assert "<script>" not in result["snippet"] and "&lt;script&gt;alert(1)&lt;/script&gt;" in result["snippet"]
+    assert f"<mark>{word}</mark>" in result["snippet"]
+
+
+def test_search_syntax_in_user_input_is_harmless(client):
+    for query in ('"unbalanced', "a AND OR NOT", "title:*", "-(", "***"):
+        assert client.get("/questions/search", params={"q": query}).status_code == 200
+
+
+def test_fallback_matches_every_word_case_insensitively(client):
+    creator_id, _ = register(client)
+    word = f"okapi{uuid.uuid4().hex[:6]}"
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            both = Question(creator_id=creator_id, title=f"{word.upper()} onboarding", description="Improve activation")
+            db.add_all([both, Question(creator_id=creator_id, title=f"{word} pricing", description="Improve revenue")])
+            await db.commit()
+            results = await _ilike_search(db, f"{word} activation", 10)
+            assert [result["id"] for result in results] == [both.id]
+            assert results[0]["rank"] == 1.0 and results[0]["snippet"] == "Improve activation"
+            markup = Question(creator_id=creator_id, title=f"{word} markup", description="<img src=x onerror=alert(1)>")
+            db.add(markup)
+            await db.commit()
+            [result] = await _ilike_search(db, f"{word} markup", 10)
+            assert result["snippet"] == "&lt;img src=x onerror=alert(1)&gt;"
+            # LIKE wildcards in the query are matched literally
+            assert await _ilike_search(db, f"{word}_", 10) == []
+
+    asyncio.run(run())
@@ -0,0 +1,29 @@
+import asyncio
+import pytest
+from app.services import transcription
+from app.services.transcription import FakeTranscriber, Transcriber, transcript_cache_key
+
+
+def test_a_backend_must_implement_transcribe():
+    class Silent(Transcriber):
+        name = "silent"
+
+    with pytest.raises(TypeError):
+        Silent()
+
+
+def test_fake_transcripts_follow_the_audio():
+    fake = FakeTranscriber()
+    first = asyncio.run(fake.transcribe(b"a" * 60000, "a.wav"))
+    assert first == asyncio.run(fake.transcribe(b"a" * 60000, "b.wav"))
+    assert first != asyncio.run(fake.transcribe(b"b" * 60000, "a.wav"))
+    assert len(first.split()) == 5
+
+
+def test_cache_keys_are_tagged_with_the_backend(monkeypatch):
+    monkeypatch.setattr(transcription, "_transcriber", FakeTranscriber())
+    assert transcript_cache_key("abc") == "fake:abc"
+    assert transcript_cache_key(None) is None
+    monkeypatch.setattr(transcription, "_transcriber", transcription.OpenAITranscriber())
+    # The API keeps the bare hash so rows cached before backends existed still hit
+    assert transcript_cache_key("abc") == "abc"
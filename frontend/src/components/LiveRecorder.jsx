@@ -0,0 +1,174 @@
+import { useState, useRef, useEffect } from 'react';
+import { api } from '../services/api';
+
+const SAMPLE_RATE = 16000;
+const SEND_INTERVAL_MS = 100;
+
+// Converts microphone samples to 16-bit PCM off the main thread
+const PCM_WORKLET = `
+class PcmCapture extends AudioWorkletProcessor {
+  process(inputs) {
+    const channel = inputs[0][0];
+    if (channel) {
+      const pcm = new Int16Array(channel.length);
+      for (let i = 0; i < channel.length; i++) {
+        const s = Math.max(-1, Math.min(1, channel[i]));
+        pcm[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
+      }
+      this.port.postMessage(pcm, [pcm.buffer]);
+    }
+    return true;
+  }
+}
+registerProcessor('pcm-capture', PcmCapture);
+`;
+
+export const liveRecordingSupported = () =>
+  typeof WebSocket !== 'undefined' && typeof AudioWorkletNode !== 'undefined';
+
+export default function LiveRecorder({ questionId, onQueued, onUnavailable }) {
+  const [isRecording, setIsRecording] = useState(false);
+  const [finishing, setFinishing] = useState(false);
+  const [recordingTime, setRecordingTime] = useState(0);
+  const [segments, setSegments] = useState([]);
+  const sessionRef = useRef(null);
+  const timerRef = useRef(null);
+
+  useEffect(() => {
+    return () => {
+      if (timerRef.current) clearInterval(timerRef.current);
+      if (sessionRef.current) sessionRef.current.teardown(true);
+    };
+  }, []);
+
+  const startRecording = async () => {
+    let stream, context, live, sender;
+    const teardown = (closeSocket) => {
+      clearInterval(sender);
+      if (stream) stream.getTracks().forEach(track => track.stop());
+      if (context) context.close();
+      if (closeSocket && live) live.close();
+    };
+
+    try {
+      stream = await navigator.mediaDevices.getUserMedia({ audio: true });
+      // The browser resamples the microphone to 16 kHz, which is all Whisper needs
+      context = new AudioContext({ sampleRate: SAMPLE_RATE });
+      const moduleUrl = URL.createObjectURL(new Blob([PCM_WORKLET], { type: 'application/javascript' }));
+      await context.audioWorklet.addModule(moduleUrl);
+      URL.revokeObjectURL(moduleUrl);
+
+      setSegments([]);
+      live = api.openLiveAttempt(questionId, localStorage.getItem('token'), context.sampleRate, (segment) => {
+        setSegments(prev => {
+          const next = [...prev];
+          next[segment.index] = segment.text;
+          return next;
+        });
+      });
+      await live.ready;
+
+      const capture = new AudioWorkletNode(context, 'pcm-capture');
+      let pending = [];
+      capture.port.onmessage = (e) => pending.push(e.data);
+      // Batch the worklet's small frames into one message per interval
+      const flush = () => {
+        if (pending.length === 0) return;
+        const length = pending.reduce((sum, chunk) => sum + chunk.length, 0);
+        const batch = new Int16Array(length);
+        let offset = 0;
+        for (const chunk of pending) {
+          batch.set(chunk, offset);
+          offset += chunk.length;
+        }
+        pending = [];
+        live.send(batch.buffer);
+      };
+      sender = setInterval(flush, SEND_INTERVAL_MS);
+      context.createMediaStreamSource(stream).connect(capture);
+
+      sessionRef.current = { live, flush, teardown };
+      setIsRecording(true);
+      setRecordingTime(0);
+      timerRef.current = setInterval(() => {
+        setRecordingTime(prev => prev + 1);
+      }, 1000);
+    } catch (err) {
+      console.error('Live recording unavailable:', err);
+      teardown(true);
+      onUnavailable(err);
+    }
+  };
+
+  const stopRecording = async () => {
+    const session = sessionRef.current;
+    if (!session) return;
+    sessionRef.current = null;
+    clearInterval(timerRef.current);
+    setIsRecording(false);
+    setFinishing(true);
+
+    session.flush();
+    session.teardown(false);
+    try {
+      const queued = await session.live.stop();
+      onQueued(queued.attempt_id);
+    } catch (err) {
+      alert(`Error submitting: ${err.message}`);
+      setFinishing(false);
+    }
+  };
+
+  const formatTime = (seconds) => {
+    const mins = Math.floor(seconds / 60);
+    const secs = seconds % 60;
+    return `${mins}:${secs.toString().padStart(2, '0')}`;
+  };
+
+  return (
+    <div style={{
+      display: 'flex',
+      flexDirection: 'column',
+      alignItems: 'center',
+      justifyContent: 'center',
+      minHeight: '400px'
+    }}>
+      <button
+        onClick={isRecording ? stopRecording : startRecording}
+        disabled={finishing}
+        style={{
+          width: '200px',
+          height: '200px',
+          borderRadius: '50%',
+          border: 'none',
+          backgroundColor: isRecording ? '#ff4444' : '#4CAF50',
+          color: 'white',
+          fontSize: '24px',
+          fontWeight: 'bold',
+          cursor: finishing ? 'not-allowed' : 'pointer',
+          opacity: finishing ? 0.6 : 1,
+          boxShadow: '0 4px 8px rgba(0,0,0,0.2)',
+        }}
+      >
+        {finishing ? 'SCORING' : isRecording ? 'STOP' : 'RECORD'}
+      </button>
+
+      {isRecording && (
+        <div style={{
+          marginTop: '30px',
+          fontSize: '32px',
+          fontWeight: 'bold',
+          color: '#333'
+        }}>
+          {formatTime(recordingTime)}
+        </div>
+      )}
+
+      {segments.length > 0 && (
+        <p style={{ marginTop: '20px', color: '#666', lineHeight: '1.6', maxWidth: '600px' }}>
+          {segments.filter(Boolean).join(' ')}
+        </p>
+      )}
+    </div>
+  );
+}
@@ -1,31 +1,110 @@
 import { useState, useEffect } from 'react';
 import { api } from '../services/api';
 
+const POLL_INTERVAL_MS = 2000;
+
 export default function AttemptResults({ attemptId, onBack }) {
   const [attempt, setAttempt] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
+  const [stage, setStage] = useState(null);
+  const [liveFeedback, setLiveFeedback] = useState('');
 
   useEffect(() => {
-    loadAttempt();
-  }, [attemptId]);
+    let cancelled = false;
+    let timer = null;
+    const controller = new AbortController();
+    const token = localStorage.getItem('token');
 
-  const loadAttempt = async () => {
-    try {
-      const token = localStorage.getItem('token');
+    const finish = async () => {
       const data = await api.getAttempt(attemptId, token);
+      if (cancelled) return;
       setAttempt(data);
-    } catch (err) {
-      setError(err.message);
-    } finally {
       setLoading(false);
-    }
-  };
+    };
+
+    // Fallback when streaming is unavailable: poll the lightweight status endpoint until it finishes
+    const poll = async () => {
+      try {
+        const status = await api.getAttemptStatus(attemptId, token);
+        if (cancelled) return;
+        if (status.status === 'completed' || status.status === 'failed') {
+          await finish();
+        } else {
+          setStage(status.stage || status.status);
+          timer = setTimeout(poll, POLL_INTERVAL_MS);
+        }
+      } catch (err) {
+        if (cancelled) return;
+        setError(err.message);
+        setLoading(false);
+      }
+    };
 
-  if (loading) return <div style={{ padding: '20px' }}>Loading results...</div>;
+    // Scoring runs in the background; stream its progress and the feedback as Claude writes it
+    const stream = async () => {
+      let finished = false;
+      try {
+        await api.streamAttempt(attemptId, token, (event, data) => {
+          if (event === 'status') {
+            setStage(data.stage || data.status);
+          } else if (event === 'feedback') {
+            setLiveFeedback((text) => (data.reset ? data.text : text + data.text));
+          } else if (event === 'completed' || event === 'failed') {
+            finished = true;
+          }
+        }, controller.signal);
+      } catch (err) {
+        if (cancelled) return;
+      }
+      if (cancelled) return;
+      if (finished) {
+        try {
+          await finish();
+        } catch (err) {
+          if (cancelled) return;
+          setError(err.message);
+          setLoading(false);
+        }
+      } else {
+        poll();
+      }
+    };
+
+    setLoading(true);
+    setLiveFeedback('');
+    stream();
+    return () => {
+      cancelled = true;
+      controller.abort();
+      clearTimeout(timer);
+    };
+  }, [attemptId]);
+
+  if (loading) {
+    return (
+      <div style={{ padding: '20px' }}>
+        Loading results...{stage && ` (${stage})`}
+        {liveFeedback && (
+          <pre style={{ marginTop: '20px', padding: '20px', backgroundColor: '#f5f5f5', borderRadius: '8px', whiteSpace: 'pre-wrap', lineHeight: '1.5' }}>
+            {liveFeedback}
+          </pre>
+        )}
+      </div>
+    );
+  }
   if (error) return <div style={{ padding: '20px', color: 'red' }}>{error}</div>;
   if (!attempt) return <div style={{ padding: '20px' }}>Results not found</div>;
 
+  if (attempt.status === 'failed') {
+    return (
+      <div style={{ padding: '20px' }}>
+        <button onClick={onBack} style={{ marginBottom: '20px' }}>Back to Questions</button>
+        <p style={{ color: 'red' }}>We couldn't score this attempt: {attempt.error || 'unknown error'}</p>
+      </div>
+    );
+  }
+
   const feedback = attempt.feedback || {};
   const scores = feedback.scores || {};
 
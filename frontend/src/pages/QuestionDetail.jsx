@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react';
 import { api } from '../services/api';
 import AudioRecorder from '../components/AudioRecorder';
+import LiveRecorder, { liveRecordingSupported } from '../components/LiveRecorder';
 
 export default function QuestionDetail({ questionId, onBack, onResults }) {
   const [question, setQuestion] = useState(null);
@@ -8,6 +9,8 @@ export default function QuestionDetail({ questionId, onBack, onResults }) {
   const [error, setError] = useState('');
   const [audioBlob, setAudioBlob] = useState(null);
   const [submitting, setSubmitting] = useState(false);
+  // Stream the answer while recording when the browser allows; otherwise record, then upload
+  const [live, setLive] = useState(liveRecordingSupported);
 
   useEffect(() => {
     loadQuestion();
@@ -80,7 +83,15 @@ export default function QuestionDetail({ questionId, onBack, onResults }) {
 
       <div style={{ textAlign: 'center' }}>
         <h3>Record Your Answer</h3>
-        <AudioRecorder onRecordingComplete={handleRecordingComplete} />
+        {live ? (
+          <LiveRecorder
+            questionId={questionId}
+            onQueued={onResults}
+            onUnavailable={() => setLive(false)}
+          />
+        ) : (
+          <AudioRecorder onRecordingComplete={handleRecordingComplete} />
+        )}
 
         {audioBlob && (
           <div style={{ marginTop: '20px' }}>
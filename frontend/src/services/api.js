@@ -1,5 +1,11 @@
 const API_URL = 'http://127.0.0.1:8000';
 
+// Public reads still carry the token when signed in, so the API can serve them from the primary right after a write
+const optionalAuth = () => {
+  const token = localStorage.getItem('token');
+  return token ? { headers: { 'Authorization': `Bearer ${token}` } } : {};
+};
+
 export const api = {
   async register(username, email, password) {
     const response = await fetch(`${API_URL}/auth/register`, {
@@ -36,7 +42,7 @@ export const api = {
   },
 
   async getQuestions() {
-    const response = await fetch(`${API_URL}/questions/`);
+    const response = await fetch(`${API_URL}/questions/`, optionalAuth());
     if (!response.ok) throw new Error('Failed to get questions');
     return response.json();
   },
@@ -58,7 +64,7 @@ export const api = {
   },
 
   async getQuestion(id) {
-    const response = await fetch(`${API_URL}/questions/${id}`);
+    const response = await fetch(`${API_URL}/questions/${id}`, optionalAuth());
     if (!response.ok) throw new Error('Failed to get question');
     return response.json();
   },
@@ -93,8 +99,100 @@ export const api = {
     return response.json();
   },
 
+  async getAttemptStatus(attemptId, token) {
+    const response = await fetch(`${API_URL}/attempts/${attemptId}/status`, {
+      headers: {
+        'Authorization': `Bearer ${token}`,
+      },
+    });
+    if (!response.ok) throw new Error('Failed to get attempt status');
+    return response.json();
+  },
+
+  // Server-Sent Events read through fetch, since EventSource cannot send the Authorization header
+  async streamAttempt(attemptId, token, onEvent, signal) {
+    const response = await fetch(`${API_URL}/attempts/${attemptId}/stream`, {
+      headers: {
+        'Authorization': `Bearer ${token}`,
+      },
+      signal,
+    });
+    if (!response.ok) throw new Error('Failed to stream attempt');
+
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+      let end;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        let event = 'message';
+        let data = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        if (data) onEvent(event, JSON.parse(data));
+      }
+    }
+  },
+
+  // Live recording: 16-bit PCM goes up a WebSocket and is transcribed in segments while the user speaks
+  openLiveAttempt(questionId, token, sampleRate, onSegment) {
+    const socket = new WebSocket(`${API_URL.replace(/^http/, 'ws')}/attempts/live`);
+    let settled = false;
+    let resolveReady, rejectReady, resolveQueued, rejectQueued;
+    const ready = new Promise((resolve, reject) => {
+      resolveReady = resolve;
+      rejectReady = reject;
+    });
+    const queued = new Promise((resolve, reject) => {
+      resolveQueued = resolve;
+      rejectQueued = reject;
+    });
+    // Callers may only await one of the two
+    ready.catch(() => {});
+    queued.catch(() => {});
+    const fail = (err) => {
+      settled = true;
+      rejectReady(err);
+      rejectQueued(err);
+    };
+
+    socket.onopen = () => {
+      socket.send(JSON.stringify({ token, question_id: questionId, sample_rate: sampleRate }));
+    };
+    socket.onmessage = (e) => {
+      const message = JSON.parse(e.data);
+      if (message.type === 'ready') resolveReady();
+      else if (message.type === 'segment') onSegment(message);
+      else if (message.type === 'queued') {
+        settled = true;
+        resolveQueued(message);
+      } else if (message.type === 'error') {
+        fail(new Error(message.detail));
+      }
+    };
+    socket.onclose = () => {
+      if (!settled) fail(new Error('Live recording connection closed'));
+    };
+
+    return {
+      ready,
+      send: (buffer) => socket.send(buffer),
+      stop: () => {
+        socket.send(JSON.stringify({ type: 'stop' }));
+        return queued;
+      },
+      close: () => socket.close(),
+    };
+  },
+
   async getGlobalLeaderboard() {
-    const response = await fetch(`${API_URL}/leaderboard/global`);
+    const response = await fetch(`${API_URL}/leaderboard/global`, optionalAuth());
     if (!response.ok) throw new Error('Failed to get leaderboard');
     return response.json();
   },